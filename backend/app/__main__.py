@@ -0,0 +1,23 @@
+"""Production server entry point: python -m app."""
+import os
+
+import uvicorn
+
+from app.config import get_settings
+
+
+def main() -> None:
+    settings = get_settings()
+    workers = settings.web_workers or 2 * (os.cpu_count() or 1) + 1
+    uvicorn.run(
+        "app.main:app",
+        host=settings.web_host,
+        port=settings.web_port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+    )
+
+
+if __name__ == "__main__":
+    main()
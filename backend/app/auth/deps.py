@@ -1,23 +1,38 @@
 """Auth dependencies for FastAPI."""
+from dataclasses import dataclass
 from typing import Annotated
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.jwt import decode_token
 from app.database import get_db
-from app.models.user import User, UserRole
+from app.models.user import Role, User, UserRole
 
 security = HTTPBearer(auto_error=False)
 
 
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Detached view of the authenticated user, safe to share across requests."""
+
+    id: int
+    is_active: bool
+    role_names: frozenset[str]
+
+
+# Per-process and never invalidated: the API has no endpoints that deactivate users or change role
+# assignments (those happen directly in the database), so such changes take effect within 30 seconds
+user_cache: TTLCache[int, UserSnapshot] = TTLCache(maxsize=10_000, ttl=30)
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> UserSnapshot:
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,22 +49,28 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    result = await db.execute(
-        select(User)
-        .where(User.id == int(user_id))
-        .options(selectinload(User.user_roles).selectinload(UserRole.role))
-    )
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    if not user.is_active:
+    user_id = int(user_id)
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        result = await db.execute(
+            select(User.is_active, Role.name)
+            .outerjoin(UserRole, UserRole.user_id == User.id)
+            .outerjoin(Role, Role.id == UserRole.role_id)
+            .where(User.id == user_id)
+        )
+        rows = result.all()
+        if not rows:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        snapshot = UserSnapshot(
+            id=user_id,
+            is_active=rows[0].is_active,
+            role_names=frozenset(r.name for r in rows if r.name),
+        )
+        user_cache[user_id] = snapshot
+    if not snapshot.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User inactive")
-    return user
+    return snapshot
 
 
-async def get_user_roles(user: Annotated[User, Depends(get_current_user)]) -> list[str]:
-    role_names = []
-    for ur in user.user_roles:
-        if ur.role:
-            role_names.append(ur.role.name)
-    return role_names
+async def get_user_roles(user: Annotated[UserSnapshot, Depends(get_current_user)]) -> list[str]:
+    return list(user.role_names)
@@ -1,20 +1,68 @@
 """JWT token handling."""
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
-from jose import JWTError, jwt
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 
 from app.config import get_settings
 
 settings = get_settings()
+_argon2 = PasswordHasher()
+
+# Decoded payloads of verified tokens, keyed by a digest of the token, until the token's own exp.
+_TOKEN_CACHE_MAX = 10_000
+_token_cache: dict[bytes, tuple[dict, float]] = {}
+_token_cache_lock = threading.Lock()
+
+# Recent successful logins: HMAC(email, password) under a per-process key -> the hash that verified.
+# A changed password hash no longer matches, and failed attempts are never cached.
+_login_cache: TTLCache[bytes, str] = TTLCache(maxsize=1024, ttl=30)
+_login_cache_key = secrets.token_bytes(32)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
+    if hashed.startswith("$argon2"):
+        try:
+            return _argon2.verify(hashed, plain)
+        except (VerificationError, InvalidHashError):
+            return False
     return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
 
 
 def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    if settings.password_hash_scheme == "argon2":
+        return _argon2.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_cost)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password off the event loop; bcrypt and argon2 release the GIL while hashing."""
+    return await asyncio.to_thread(verify_password, plain, hashed)
+
+
+async def verify_login_async(email: str, plain: str, hashed: str) -> bool:
+    """verify_password_async that skips the slow hash when the same credentials verified seconds ago."""
+    key = hmac.new(_login_cache_key, f"{email}\0{plain}".encode("utf-8"), hashlib.sha256).digest()
+    if _login_cache.get(key) == hashed:
+        return True
+    ok = await verify_password_async(plain, hashed)
+    if ok:
+        _login_cache[key] = hashed
+    return ok
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.to_thread(get_password_hash, password)
 
 
 def create_access_token(data: dict) -> str:
@@ -24,8 +72,31 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
+def _cache_payload(key: bytes, payload: dict) -> None:
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)):
+        return
+    now = time.time()
+    with _token_cache_lock:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            for k in [k for k, (_, e) in _token_cache.items() if e <= now]:
+                del _token_cache[k]
+            if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                _token_cache.clear()
+        _token_cache[key] = (payload, float(exp))
+
+
 def decode_token(token: str) -> dict | None:
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached is not None:
+            if cached[1] > time.time():
+                return cached[0]
+            del _token_cache[key]
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-    except JWTError:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except jwt.InvalidTokenError:
         return None
+    _cache_payload(key, payload)
+    return payload
@@ -29,6 +29,9 @@ class Role(str, Enum):
 def require_roles(*allowed: Role) -> Callable:
     """Decorator to require specific roles."""
 
+    allowed_names = frozenset(r.value for r in allowed)
+    allowed_detail = f"Requires one of: {[r.value for r in allowed]}"
+
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -38,12 +41,10 @@ def require_roles(*allowed: Role) -> Callable:
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="No roles assigned",
                 )
-            user_role_names = [r.lower() for r in user_roles]
-            allowed_names = [r.value for r in allowed]
-            if not any(r in user_role_names for r in allowed_names):
+            if allowed_names.isdisjoint(r.lower() for r in user_roles):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Requires one of: {allowed_names}",
+                    detail=allowed_detail,
                 )
             return await func(*args, **kwargs)
 
@@ -52,39 +53,32 @@ def require_roles(*allowed: Role) -> Callable:
     return decorator
 
 
+_CREATE_PROJECT = frozenset({"admin", "delivery_manager", "business_analyst", "finance_reviewer"})
+_EDIT_TEAM = frozenset({"admin", "delivery_manager"})
+_EDIT_FEATURES = frozenset({"admin", "delivery_manager", "business_analyst"})
+_MODIFY_EFFORT = frozenset({"admin", "technical_architect"})
+_LOCK_PROJECT = frozenset({"admin", "finance_reviewer"})
+_DELETE_PROJECT = _CREATE_PROJECT
+
+
 def can_create_project(roles: list[str]) -> bool:
-    return any(
-        r.lower() in ["admin", "delivery_manager", "business_analyst", "finance_reviewer"]
-        for r in roles
-    )
+    return any(r.lower() in _CREATE_PROJECT for r in roles)
 
 
 def can_edit_team(roles: list[str]) -> bool:
-    return any(
-        r.lower() in ["admin", "delivery_manager"]
-        for r in roles
-    )
+    return any(r.lower() in _EDIT_TEAM for r in roles)
 
 
 def can_edit_features(roles: list[str]) -> bool:
-    return any(
-        r.lower() in ["admin", "delivery_manager", "business_analyst"]
-        for r in roles
-    )
+    return any(r.lower() in _EDIT_FEATURES for r in roles)
 
 
 def can_modify_effort(roles: list[str]) -> bool:
-    return any(
-        r.lower() in ["admin", "technical_architect"]
-        for r in roles
-    )
+    return any(r.lower() in _MODIFY_EFFORT for r in roles)
 
 
 def can_lock_project(roles: list[str]) -> bool:
-    return any(
-        r.lower() in ["admin", "finance_reviewer"]
-        for r in roles
-    )
+    return any(r.lower() in _LOCK_PROJECT for r in roles)
 
 
 def can_unlock_project(roles: list[str]) -> bool:
@@ -92,7 +86,4 @@ def can_unlock_project(roles: list[str]) -> bool:
 
 
 def can_delete_project(roles: list[str]) -> bool:
-    return any(
-        r.lower() in ["admin", "delivery_manager", "business_analyst", "finance_reviewer"]
-        for r in roles
-    )
+    return any(r.lower() in _DELETE_PROJECT for r in roles)
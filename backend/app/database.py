@@ -1,13 +1,57 @@
 """Database connection and session management."""
+import asyncio
+from uuid import uuid4
+
+import orjson
+from sqlalchemy import make_url, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, raiseload
+from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
 
 settings = get_settings()
+
+connect_args = {}
+if make_url(settings.database_url).get_driver_name() == "asyncpg":
+    # asyncpg's own statement cache plus SQLAlchemy's prepared-statement cache per connection
+    connect_args = {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+    if settings.db_null_pool:
+        # PgBouncer transaction pooling hands each transaction a different server connection, so cached
+        # prepared statements go missing or collide by name: disable both caches and name statements uniquely
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+if settings.db_null_pool:
+    pool_args = {"poolclass": NullPool}
+else:
+    pool_args = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _json_dumps(value) -> str:
+    return orjson.dumps(value).decode()
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.app_env == "development",
+    connect_args=connect_args,
+    # JSONB columns (feature tasks, sprint plan allocations) round-trip through orjson
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **pool_args,
 )
 async_session_maker = async_sessionmaker(
     engine,
@@ -18,6 +62,11 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def strict_loading() -> tuple:
+    """Options appended after explicit eager loads: with DEBUG on, any other relationship access raises."""
+    return (raiseload("*"),) if settings.debug else ()
+
+
 class Base(DeclarativeBase):
     """Base class for all models."""
 
@@ -41,3 +90,16 @@ async def init_db() -> None:
     """Create all tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_pool() -> None:
+    """Open the pool's connections up front so the first requests skip connect and handshake."""
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    size = getattr(engine.pool, "size", None)
+    if size is None:  # NullPool keeps nothing open
+        return
+    await asyncio.gather(*(_ping() for _ in range(size())))
@@ -0,0 +1,65 @@
+"""In-process cache of engine results, keyed by a content hash of the calculation inputs."""
+from decimal import Decimal
+from hashlib import blake2b
+from typing import Any, NamedTuple
+
+from cachetools import TTLCache
+
+from app.engine.calculator import CalculationEngine
+from app.models.feature import Feature
+from app.models.project import ProjectVersion
+from app.models.team import TeamMember
+
+
+class CalcResult(NamedTuple):
+    base_cost: Decimal
+    revenue: Decimal
+
+
+# Keys cover every input the engine reads, so an edit to features, team, allocations or
+# rates yields a new key; the TTL only bounds memory.
+calc_cache: TTLCache[bytes, CalcResult] = TTLCache(maxsize=1024, ttl=300)
+
+
+def _inputs_key(
+    version: ProjectVersion,
+    project: Any,
+    team_members: list[TeamMember],
+    features: list[Feature],
+    effort_allocations: dict[int, list[Any]],
+    default_rates: dict[str, tuple[Decimal, Decimal]],
+) -> bytes:
+    h = blake2b(digest_size=16)
+    h.update(repr((version.id, project.revenue_model, project.fixed_revenue)).encode())
+    for m in team_members:
+        h.update(repr((
+            m.role, m.cost_rate_per_day, m.monthly_cost_rate, m.working_days_per_month,
+            m.billing_rate_per_day, m.billing_rate, m.hours_per_day, m.utilization_pct,
+        )).encode())
+    for f in features:
+        h.update(repr((f.id, f.effort_hours)).encode())
+        for a in effort_allocations.get(f.id, ()):
+            h.update(repr((a.role, a.effort_hours)).encode())
+    h.update(repr(sorted(default_rates.items())).encode())
+    return h.digest()
+
+
+def cost_and_revenue(
+    engine: CalculationEngine,
+    version: ProjectVersion,
+    project: Any,
+    team_members: list[TeamMember],
+    features: list[Feature],
+    effort_allocations: dict[int, list[Any]],
+    default_rates: dict[str, tuple[Decimal, Decimal]],
+) -> CalcResult:
+    """Base cost and revenue for a version, served from calc_cache when inputs are unchanged."""
+    key = _inputs_key(version, project, team_members, features, effort_allocations, default_rates)
+    result = calc_cache.get(key)
+    if result is None:
+        result = CalcResult(
+            base_cost=engine.base_cost(team_members, features, effort_allocations, default_rates),
+            revenue=engine.revenue(version, project, team_members, features, effort_allocations, default_rates),
+        )
+        calc_cache[key] = result
+    return result
@@ -7,69 +7,144 @@ from app.models.feature import Feature
 from app.models.project import ProjectVersion, RevenueModel, SprintConfig
 from app.models.team import TeamMember
 
+_D0 = Decimal(0)
+_D1 = Decimal(1)
+_D8 = Decimal(8)
+_D100 = Decimal(100)
+_ZERO_RATE = (_D0, _D0)
+_QUANTIZERS = {places: Decimal(10) ** -places for places in range(7)}
 
-def _task_contingency_multiplier(role: str, settings) -> Decimal:
-    """Task-level contingency by seniority from config."""
-    if not role or not role.strip():
-        return Decimal(str(settings.task_contingency_default))
-    r = role.strip().lower()
-    if "junior" in r or "jr " in r:
-        return Decimal(str(settings.task_contingency_junior))
-    if "senior" in r or "sr " in r or "lead" in r:
-        return Decimal(str(settings.task_contingency_senior))
-    return Decimal(str(settings.task_contingency_default))
+
+def _index_rates(default_rates: dict[str, tuple[Decimal, Decimal]]) -> dict[str, tuple[Decimal, Decimal]]:
+    """BU rates keyed by exact role and by lower-cased role; build once per calculation."""
+    index: dict[str, tuple[Decimal, Decimal]] = {}
+    for k, v in default_rates.items():
+        index.setdefault(k.lower(), v)
+    index.update(default_rates)
+    return index
 
 
-def _get_bu_rate_for_role(role: str, default_rates: dict[str, tuple[Decimal, Decimal]]) -> tuple[Decimal, Decimal]:
-    """Get BU (cost, billing) rate for role. Case-insensitive lookup."""
+def _get_bu_rate_for_role(role: str, rates: dict[str, tuple[Decimal, Decimal]]) -> tuple[Decimal, Decimal]:
+    """Get BU (cost, billing) rate for role from an _index_rates() index. Case-insensitive lookup."""
     if not role or not role.strip():
-        return (Decimal(0), Decimal(0))
+        return _ZERO_RATE
     r = role.strip()
-    if r in default_rates:
-        return default_rates[r]
-    lower = r.lower()
-    for k, v in default_rates.items():
-        if k.lower() == lower:
-            return v
-    return (Decimal(0), Decimal(0))
+    rate = rates.get(r)
+    if rate is None:
+        rate = rates.get(r.lower())
+    return rate if rate is not None else _ZERO_RATE
 
 
 def _resolve_cost_rate_per_day(
     member: TeamMember,
-    default_rates: dict[str, tuple[Decimal, Decimal]],
+    rates: dict[str, tuple[Decimal, Decimal]],
 ) -> Decimal:
     """Cost rate per day: member override or BU default."""
     if member.cost_rate_per_day is not None and member.cost_rate_per_day > 0:
         return member.cost_rate_per_day
     if member.monthly_cost_rate is not None and member.monthly_cost_rate > 0 and member.working_days_per_month:
         return member.monthly_cost_rate / Decimal(member.working_days_per_month)
-    cost_rate, _ = _get_bu_rate_for_role(member.role, default_rates)
+    cost_rate, _ = _get_bu_rate_for_role(member.role, rates)
     return cost_rate
 
 
 def _resolve_billing_rate_per_day(
     member: TeamMember,
-    default_rates: dict[str, tuple[Decimal, Decimal]],
+    rates: dict[str, tuple[Decimal, Decimal]],
 ) -> Decimal:
     """Billing rate per day: member override or BU default."""
     if member.billing_rate_per_day is not None and member.billing_rate_per_day > 0:
         return member.billing_rate_per_day
     if member.billing_rate is not None and member.billing_rate > 0 and member.hours_per_day:
         return member.billing_rate * Decimal(member.hours_per_day)
-    _, billing_rate = _get_bu_rate_for_role(member.role, default_rates)
+    _, billing_rate = _get_bu_rate_for_role(member.role, rates)
     return billing_rate
 
 
+def _flatten_allocations(
+    features: list[Feature],
+    effort_allocations: dict[int, list[Any]],
+) -> tuple[dict[str, Decimal], Decimal]:
+    """Collapse allocations to hours per role, plus hours of features with no allocations.
+
+    Every per-role formula downstream is linear in hours, so this is the only pass over
+    the feature/allocation objects a calculation needs.
+    """
+    hours_by_role: dict[str, Decimal] = {}
+    unallocated = _D0
+    for feature in features:
+        allocations = effort_allocations.get(feature.id)
+        if allocations:
+            for alloc in allocations:
+                hours_by_role[alloc.role] = hours_by_role.get(alloc.role, _D0) + alloc.effort_hours
+        else:
+            unallocated += feature.effort_hours
+    return hours_by_role, unallocated
+
+
+def _members_by_role(team_members: list[TeamMember]) -> dict[str, TeamMember]:
+    """First team member per role, for O(1) allocation -> member lookup."""
+    by_role: dict[str, TeamMember] = {}
+    for m in team_members:
+        by_role.setdefault(m.role, m)
+    return by_role
+
+
 class CalculationEngine:
     """Deterministic financial calculation engine. Rates are per day."""
 
     def __init__(self) -> None:
         self.settings = get_settings()
+        # Settings snapshotted as Decimals once, not re-read and re-parsed per role
+        self._mult = {
+            "junior": Decimal(str(self.settings.task_contingency_junior)),
+            "senior": Decimal(str(self.settings.task_contingency_senior)),
+            "default": Decimal(str(self.settings.task_contingency_default)),
+        }
+        self._mult_cache: dict[str, Decimal] = {}
+        self._flat: tuple[Any, Any, tuple[dict[str, Decimal], Decimal]] | None = None
+        self._default_hours = Decimal(self.settings.default_hours_per_day)
+        self._default_util = Decimal(str(self.settings.default_utilization_pct / 100))
+        self._effort_override_threshold = Decimal(str(self.settings.effort_override_threshold))
+        self._margin_threshold = Decimal(str(self.settings.margin_threshold_warning))
+
+    def _task_contingency_multiplier(self, role: str) -> Decimal:
+        """Task-level contingency by seniority from config, memoized per role string."""
+        mult = self._mult_cache.get(role)
+        if mult is None:
+            r = (role or "").strip().lower()
+            if "junior" in r or "jr " in r:
+                mult = self._mult["junior"]
+            elif "senior" in r or "sr " in r or "lead" in r:
+                mult = self._mult["senior"]
+            else:
+                mult = self._mult["default"]
+            self._mult_cache[role] = mult
+        return mult
+
+    def _flatten(
+        self,
+        features: list[Feature],
+        effort_allocations: dict[int, list[Any]],
+    ) -> tuple[dict[str, Decimal], Decimal]:
+        """_flatten_allocations, reused while the engine sees the same input objects.
+
+        Engines are built per request, so cost, revenue and effort for one version share a
+        single pass. Callers must not mutate the inputs between calls.
+        """
+        flat = self._flat
+        if flat is not None and flat[0] is features and flat[1] is effort_allocations:
+            return flat[2]
+        result = _flatten_allocations(features, effort_allocations)
+        self._flat = (features, effort_allocations, result)
+        return result
 
     @staticmethod
     def _round(value: Decimal, places: int = 2) -> Decimal:
         """Round for internal calculation - display layer rounds for output."""
-        quantize = Decimal(10) ** -places
+        quantize = _QUANTIZERS.get(places)
+        if quantize is None:
+            quantize = Decimal(10) ** -places
         return value.quantize(quantize, rounding=ROUND_HALF_UP)
 
     def cost_per_day(
@@ -78,15 +153,15 @@ class CalculationEngine:
         default_rates: dict[str, tuple[Decimal, Decimal]],
     ) -> Decimal:
         """Effective cost per day = cost_rate_per_day / utilization (cost when fully utilized)."""
-        rate = _resolve_cost_rate_per_day(member, default_rates)
-        utilization = member.utilization_pct / Decimal(100)
+        rate = _resolve_cost_rate_per_day(member, _index_rates(default_rates))
+        utilization = member.utilization_pct / _D100
         if utilization == 0:
-            return Decimal(0)
+            return _D0
         return self._round(rate / utilization)
 
     def total_effort_hours(self, features: list[Feature]) -> Decimal:
         """Sum of all feature effort hours (base, no contingency)."""
-        return sum(f.effort_hours for f in features)
+        return sum((f.effort_hours for f in features), _D0)
 
     def total_effort_hours_with_task_contingency(
         self,
@@ -94,16 +169,10 @@ class CalculationEngine:
         effort_allocations: dict[int, list[Any]],
     ) -> Decimal:
         """Sum of effort hours with task-level contingency (Jr/Sr) applied."""
-        total = Decimal(0)
-        for feature in features:
-            allocations = effort_allocations.get(feature.id, [])
-            if allocations:
-                for alloc in allocations:
-                    mult = _task_contingency_multiplier(alloc.role, self.settings)
-                    total += alloc.effort_hours * mult
-            else:
-                mult = Decimal(str(self.settings.task_contingency_default))
-                total += feature.effort_hours * mult
+        hours_by_role, unallocated = self._flatten(features, effort_allocations)
+        total = unallocated * self._mult["default"]
+        for role, hours in hours_by_role.items():
+            total += hours * self._task_contingency_multiplier(role)
         return self._round(total)
 
     def base_cost(
@@ -113,47 +182,41 @@ class CalculationEngine:
         effort_allocations: dict[int, list[Any]],
         default_rates: dict[str, tuple[Decimal, Decimal]],
     ) -> Decimal:
-        """Total Cost = Σ (Effort Hours × Cost per Hour). Cost per hour = cost_rate_per_day / (hours_per_day * utilization)."""
-        total = Decimal(0)
-        for feature in features:
-            allocations = effort_allocations.get(feature.id, [])
-            if allocations:
-                for alloc in allocations:
-                    base_hours = alloc.effort_hours
-                    mult = _task_contingency_multiplier(alloc.role, self.settings)
-                    role_hours = base_hours * mult
-                    member = next(
-                        (m for m in team_members if m.role == alloc.role),
-                        None,
-                    )
-                    if member:
-                        cost_rate = _resolve_cost_rate_per_day(member, default_rates)
-                        hours_per_day = Decimal(member.hours_per_day or self.settings.default_hours_per_day)
-                        util = member.utilization_pct / Decimal(100)
-                        if hours_per_day > 0 and util > 0:
-                            cost_per_hour = cost_rate / (hours_per_day * util)
-                            total += role_hours * cost_per_hour
-                    else:
-                        cost_rate, _ = _get_bu_rate_for_role(alloc.role, default_rates)
-                        hours_per_day = Decimal(self.settings.default_hours_per_day)
-                        util = Decimal(str(self.settings.default_utilization_pct / 100))
-                        if cost_rate > 0 and hours_per_day > 0 and util > 0:
-                            cost_per_hour = cost_rate / (hours_per_day * util)
-                            total += role_hours * cost_per_hour
+        """Total Cost = Σ (Effort Hours × Cost per Hour). Cost per hour = cost_rate_per_day / (hours_per_day * utilization).
+
+        Hours are reduced per role first, so rates and contingency are resolved once per distinct role.
+        """
+        hours_by_role, unallocated = self._flatten(features, effort_allocations)
+
+        by_role = _members_by_role(team_members)
+        rates = _index_rates(default_rates)
+        total = _D0
+        for role, base_hours in hours_by_role.items():
+            role_hours = base_hours * self._task_contingency_multiplier(role)
+            member = by_role.get(role)
+            if member:
+                cost_rate = _resolve_cost_rate_per_day(member, rates)
+                hours_per_day = Decimal(member.hours_per_day) if member.hours_per_day else self._default_hours
+                util = member.utilization_pct / _D100
+                if hours_per_day > 0 and util > 0:
+                    cost_per_hour = cost_rate / (hours_per_day * util)
+                    total += role_hours * cost_per_hour
             else:
-                total_hours = feature.effort_hours
-                mult = Decimal(str(self.settings.task_contingency_default))
-                if team_members:
-                    mult = _task_contingency_multiplier(team_members[0].role, self.settings)
-                role_hours = total_hours * mult
-                if team_members:
-                    m0 = team_members[0]
-                    cost_rate = _resolve_cost_rate_per_day(m0, default_rates)
-                    hours_per_day = Decimal(m0.hours_per_day or self.settings.default_hours_per_day)
-                    util = m0.utilization_pct / Decimal(100)
-                    if hours_per_day > 0 and util > 0:
-                        cost_per_hour = cost_rate / (hours_per_day * util)
-                        total += role_hours * cost_per_hour
+                cost_rate, _ = _get_bu_rate_for_role(role, rates)
+                hours_per_day = self._default_hours
+                util = self._default_util
+                if cost_rate > 0 and hours_per_day > 0 and util > 0:
+                    cost_per_hour = cost_rate / (hours_per_day * util)
+                    total += role_hours * cost_per_hour
+        if unallocated and team_members:
+            m0 = team_members[0]
+            role_hours = unallocated * self._task_contingency_multiplier(m0.role)
+            cost_rate = _resolve_cost_rate_per_day(m0, rates)
+            hours_per_day = Decimal(m0.hours_per_day) if m0.hours_per_day else self._default_hours
+            util = m0.utilization_pct / _D100
+            if hours_per_day > 0 and util > 0:
+                cost_per_hour = cost_rate / (hours_per_day * util)
+                total += role_hours * cost_per_hour
         return self._round(total)
 
     def cost_with_buffers(
@@ -163,8 +226,8 @@ class CalculationEngine:
         management_reserve_pct: Decimal,
     ) -> tuple[Decimal, Decimal, Decimal]:
         """Base cost + risk buffer + total cost."""
-        contingency = base_cost * (contingency_pct / Decimal(100))
-        reserve = base_cost * (management_reserve_pct / Decimal(100))
+        contingency = base_cost * (contingency_pct / _D100)
+        reserve = base_cost * (management_reserve_pct / _D100)
         risk_buffer = self._round(contingency + reserve)
         total = self._round(base_cost + risk_buffer)
         return (base_cost, risk_buffer, total)
@@ -187,44 +250,36 @@ class CalculationEngine:
             return sum(milestone_amounts)
 
         if project.revenue_model == RevenueModel.T_M:
-            total = Decimal(0)
-            for feature in features:
-                allocations = effort_allocations.get(feature.id, [])
-                if allocations:
-                    for alloc in allocations:
-                        member = next(
-                            (m for m in team_members if m.role == alloc.role),
-                            None,
-                        )
-                        if member:
-                            billing_per_day = _resolve_billing_rate_per_day(member, default_rates)
-                            hours_per_day = Decimal(member.hours_per_day or 8)
-                            if hours_per_day > 0:
-                                effort_days = alloc.effort_hours / hours_per_day
-                                total += effort_days * billing_per_day
-                        else:
-                            _, billing_per_day = _get_bu_rate_for_role(alloc.role, default_rates)
-                            hours_per_day = Decimal(8)
-                            if billing_per_day > 0 and hours_per_day > 0:
-                                effort_days = alloc.effort_hours / hours_per_day
-                                total += effort_days * billing_per_day
+            hours_by_role, unallocated = self._flatten(features, effort_allocations)
+
+            by_role = _members_by_role(team_members)
+            rates = _index_rates(default_rates)
+            total = _D0
+            for role, hours in hours_by_role.items():
+                member = by_role.get(role)
+                if member:
+                    billing_per_day = _resolve_billing_rate_per_day(member, rates)
+                    hours_per_day = Decimal(member.hours_per_day) if member.hours_per_day else _D8
+                    if hours_per_day > 0:
+                        total += hours / hours_per_day * billing_per_day
                 else:
-                    total_hours = feature.effort_hours
-                    if team_members:
-                        billing_per_day = _resolve_billing_rate_per_day(team_members[0], default_rates)
-                        hours_per_day = Decimal(team_members[0].hours_per_day or 8)
-                        if hours_per_day > 0:
-                            effort_days = total_hours / hours_per_day
-                            total += effort_days * billing_per_day
+                    _, billing_per_day = _get_bu_rate_for_role(role, rates)
+                    if billing_per_day > 0:
+                        total += hours / _D8 * billing_per_day
+            if unallocated and team_members:
+                billing_per_day = _resolve_billing_rate_per_day(team_members[0], rates)
+                hours_per_day = Decimal(team_members[0].hours_per_day) if team_members[0].hours_per_day else _D8
+                if hours_per_day > 0:
+                    total += unallocated / hours_per_day * billing_per_day
             return self._round(total)
 
-        return Decimal(0)
+        return _D0
 
     def gross_margin(self, revenue: Decimal, cost: Decimal) -> Decimal | None:
         """Gross Margin % = (Revenue - Cost) / Revenue × 100."""
         if revenue == 0:
             return None
-        return self._round((revenue - cost) / revenue * Decimal(100))
+        return self._round((revenue - cost) / revenue * _D100)
 
     def net_margin(self, revenue: Decimal, total_cost: Decimal) -> Decimal | None:
         """Net Margin % (with reserve applied)."""
@@ -233,10 +288,10 @@ class CalculationEngine:
     def reverse_margin_revenue(self, cost: Decimal, target_margin_pct: Decimal) -> Decimal:
         """Required Revenue = Cost / (1 - Target Margin)."""
         if target_margin_pct >= 100:
-            return Decimal(0)
-        factor = Decimal(1) - (target_margin_pct / Decimal(100))
+            return _D0
+        factor = _D1 - (target_margin_pct / _D100)
         if factor <= 0:
-            return Decimal(0)
+            return _D0
         return self._round(cost / factor)
 
     def reverse_margin_billing_rate(
@@ -247,11 +302,11 @@ class CalculationEngine:
     ) -> Decimal:
         """Required Billing Rate per day = Required Revenue / Total Effort Days."""
         if total_effort_hours <= 0:
-            return Decimal(0)
+            return _D0
         required_revenue = self.reverse_margin_revenue(total_cost, target_margin_pct)
-        effort_days = total_effort_hours / Decimal(8)
+        effort_days = total_effort_hours / _D8
         if effort_days <= 0:
-            return Decimal(0)
+            return _D0
         return self._round(required_revenue / effort_days)
 
     def sprint_capacity(
@@ -272,12 +327,12 @@ class CalculationEngine:
             days_in_sprint = Decimal(
                 self.settings.default_working_days_per_month * self.settings.default_sprint_duration_weeks // 2
             )
-        total = Decimal(0)
+        total = _D0
         for m in team_members:
             capacity = (
                 days_in_sprint
                 * Decimal(m.hours_per_day)
-                * (m.utilization_pct / Decimal(100))
+                * (m.utilization_pct / _D100)
             )
             total += capacity
         return self._round(total)
@@ -300,14 +355,14 @@ class CalculationEngine:
         """Check if effort change exceeds ±15% threshold."""
         if previous_effort == 0:
             return new_effort != 0
-        pct_change = abs((new_effort - previous_effort) / previous_effort * Decimal(100))
-        return pct_change > Decimal(str(self.settings.effort_override_threshold))
+        pct_change = abs((new_effort - previous_effort) / previous_effort * _D100)
+        return pct_change > self._effort_override_threshold
 
     def margin_below_threshold(self, margin_pct: Decimal | None) -> bool:
         """Check if margin is below warning threshold (e.g. 15%)."""
         if margin_pct is None:
             return False
-        return margin_pct < Decimal(str(self.settings.margin_threshold_warning))
+        return margin_pct < self._margin_threshold
 
     def sprint_plan_cost(
         self,
@@ -315,8 +370,8 @@ class CalculationEngine:
         team_members: list[TeamMember],
         default_rates: dict[str, tuple[Decimal, Decimal]],
         sprint_config: dict | None,
-        contingency_pct: Decimal = Decimal(0),
-        management_reserve_pct: Decimal = Decimal(0),
+        contingency_pct: Decimal = _D0,
+        management_reserve_pct: Decimal = _D0,
     ) -> tuple[Decimal, Decimal, Decimal]:
         """
         Cost from sprint plan: FTE × cost_rate_per_day × duration_days per row.
@@ -332,27 +387,23 @@ class CalculationEngine:
         if days_per_sprint <= 0:
             days_per_sprint = Decimal(10)
 
+        rates = _index_rates(default_rates)
         role_to_rate: dict[str, Decimal] = {}
         for m in team_members:
             r = (m.role or "").strip()
             if r and r not in role_to_rate:
-                role_to_rate[r] = _resolve_cost_rate_per_day(m, default_rates)
-        for role in set(k for row in sprint_plan_rows for k in (row.get("allocations") or {})):
-            if role and role not in role_to_rate:
-                rate, _ = _get_bu_rate_for_role(role, default_rates)
-                role_to_rate[role] = rate
+                role_to_rate[r] = _resolve_cost_rate_per_day(m, rates)
 
-        total = Decimal(0)
+        total = _D0
         for row in sprint_plan_rows:
             allocations = row.get("allocations") or {}
-            row_type = row.get("row_type") or ""
-            if row_type == "phase":
-                days = days_per_sprint
-            else:
-                days = days_per_sprint
+            days = days_per_sprint
             for role, fte in allocations.items():
-                rate = role_to_rate.get((role or "").strip(), Decimal(0))
-                fte_val = Decimal(str(fte)) if fte is not None else Decimal(0)
+                r = (role or "").strip()
+                rate = role_to_rate.get(r)
+                if rate is None:
+                    rate = role_to_rate[r] = _get_bu_rate_for_role(r, rates)[0]
+                fte_val = Decimal(str(fte)) if fte is not None else _D0
                 total += fte_val * rate * days
         base = self._round(total)
         return self.cost_with_buffers(base, contingency_pct, management_reserve_pct)
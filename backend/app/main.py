@@ -5,7 +5,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.database import init_db
+from app.database import init_db, warm_pool
+from app.responses import ORJSONResponse
+from app.services import ai_service, document_extractor
 from app.routers import auth, bu_rates, calculations, features, projects, repository, sprint_plan, team, versions
 
 settings = get_settings()
@@ -14,8 +16,10 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await warm_pool()
     yield
-    pass
+    await ai_service.close_client()
+    document_extractor.shutdown_pool()
 
 
 app = FastAPI(
@@ -23,6 +27,8 @@ app = FastAPI(
     description="Delivery planning, effort estimation, cost and profitability engine",
     version="1.0.0",
     lifespan=lifespan,
+    redirect_slashes=False,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -33,15 +39,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(auth.router)
-app.include_router(bu_rates.router)
-app.include_router(projects.router)
-app.include_router(sprint_plan.router)
-app.include_router(versions.router)
-app.include_router(team.router)
-app.include_router(features.router)
-app.include_router(calculations.router)
-app.include_router(repository.router)
+for module in (auth, bu_rates, projects, sprint_plan, versions, team, features, calculations, repository):
+    app.include_router(module.router)
 
 
 @app.get("/health")
@@ -1,7 +1,7 @@
 """Estimation history and justification models."""
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, Text, desc, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -29,6 +29,14 @@ class EstimationHistory(Base):
     """Track estimation changes per version."""
 
     __tablename__ = "estimation_history"
+    __table_args__ = (
+        Index(
+            "ix_estimation_history_version_feature_changed_at",
+            "version_id",
+            "feature_id",
+            desc("changed_at"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     version_id: Mapped[int] = mapped_column(
@@ -50,6 +58,14 @@ class JustificationLog(Base):
     """Justification when TA overrides effort > threshold."""
 
     __tablename__ = "justification_logs"
+    __table_args__ = (
+        Index(
+            "ix_justification_logs_version_feature_created_at",
+            "version_id",
+            "feature_id",
+            desc("created_at"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     version_id: Mapped[int] = mapped_column(
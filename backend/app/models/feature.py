@@ -2,7 +2,7 @@
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,14 @@ class Feature(Base):
     """Feature entity with effort and task breakdown."""
 
     __tablename__ = "features"
+    __table_args__ = (
+        Index(
+            "idx_features_tasks_gin",
+            "tasks",
+            postgresql_using="gin",
+            postgresql_ops={"tasks": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     version_id: Mapped[int] = mapped_column(
@@ -2,7 +2,7 @@
 from decimal import Decimal
 from enum import Enum as PyEnum
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -31,10 +31,11 @@ class Project(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     client_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Plain strings validated against RevenueModel in the API layer; new values need no DDL
     revenue_model: Mapped[str] = mapped_column(
-        Enum(RevenueModel),
+        String(16),
         nullable=False,
-        default=RevenueModel.FIXED,
+        default=RevenueModel.FIXED.value,
     )
     currency: Mapped[str] = mapped_column(String(3), nullable=False, default="USD")
     sprint_duration_weeks: Mapped[int] = mapped_column(Integer, nullable=False, default=2)
@@ -50,6 +51,8 @@ class Project(Base):
         back_populates="project",
         order_by="ProjectVersion.version_number.desc()",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
 
 
@@ -57,14 +60,17 @@ class ProjectVersion(Base):
     """Immutable version snapshot of project plan."""
 
     __tablename__ = "project_versions"
+    __table_args__ = (
+        Index("ix_project_versions_project_id_version_number", "project_id", "version_number"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     version_number: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[str] = mapped_column(
-        Enum(ProjectStatus),
+        String(16),
         nullable=False,
-        default=ProjectStatus.DRAFT,
+        default=ProjectStatus.DRAFT.value,
     )
     is_locked: Mapped[bool] = mapped_column(Boolean, default=False)
     locked_by: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
@@ -76,28 +82,38 @@ class ProjectVersion(Base):
     management_reserve_pct: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=0)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    project: Mapped["Project"] = relationship("Project", back_populates="versions")
+    # Relationships must be eager-loaded explicitly; an implicit lazy load raises instead of
+    # issuing a query. Child rows are removed by the ON DELETE CASCADE foreign keys.
+    project: Mapped["Project"] = relationship("Project", back_populates="versions", lazy="raise_on_sql")
     team_members: Mapped[list["TeamMember"]] = relationship(
         "TeamMember",
         back_populates="version",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
     features: Mapped[list["Feature"]] = relationship(
         "Feature",
         back_populates="version",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
     sprint_config: Mapped["SprintConfig | None"] = relationship(
         "SprintConfig",
         back_populates="version",
         uselist=False,
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
     sprint_plan_rows: Mapped[list["SprintPlanRow"]] = relationship(
         "SprintPlanRow",
         back_populates="version",
         cascade="all, delete-orphan",
         order_by="SprintPlanRow.sort_order",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
 
 
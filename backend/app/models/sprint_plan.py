@@ -1,5 +1,5 @@
 """Sprint plan allocation model."""
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,14 @@ class SprintPlanRow(Base):
     """Sprint plan row per version - stores role allocations (1=100%, 0.5=50%, etc.)."""
 
     __tablename__ = "sprint_plan_rows"
+    __table_args__ = (
+        Index(
+            "idx_sprint_plan_rows_allocations_gin",
+            "allocations",
+            postgresql_using="gin",
+            postgresql_ops={"allocations": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     version_id: Mapped[int] = mapped_column(
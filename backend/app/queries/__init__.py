@@ -0,0 +1 @@
+"""Shared query builders."""
@@ -0,0 +1,19 @@
+"""Project version lookups shared by the routers."""
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import ProjectVersion
+
+# Built once; the project id is bound per call
+LATEST_VERSION = (
+    select(ProjectVersion)
+    .where(ProjectVersion.project_id == bindparam("project_id"))
+    .order_by(ProjectVersion.version_number.desc())
+    .limit(1)
+)
+
+
+async def get_latest_version(db: AsyncSession, project_id: int, *options) -> ProjectVersion | None:
+    """Latest version of the project, or None; loader options are applied to the same query."""
+    stmt = LATEST_VERSION.options(*options) if options else LATEST_VERSION
+    return await db.scalar(stmt, {"project_id": project_id})
@@ -0,0 +1,18 @@
+"""orjson-backed JSON response that keeps the API's Decimal wire format."""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+
+def _default(obj: Any) -> Any:
+    # Same as Pydantic's JSON mode: Decimals go out as strings so no precision is lost
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+class ORJSONResponse(_ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -2,36 +2,48 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.auth.jwt import create_access_token
 from app.database import get_db
-from app.models.user import User
+from app.models.user import Role, User, UserRole
 from app.schemas.auth import Token, UserCreate, UserLogin, UserResponse
 from app.services.auth_service import authenticate_user, create_user, user_to_response
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Unique indexes on users.email (the column's own and the case-insensitive one from migration 007)
+_EMAIL_CONSTRAINTS = frozenset({"ix_users_email", "ix_users_email_lower"})
+
+
+def _is_duplicate_email(e: IntegrityError) -> bool:
+    # asyncpg's error, with the violated constraint's name, is the cause of the DBAPI error
+    return getattr(e.orig.__cause__, "constraint_name", None) in _EMAIL_CONSTRAINTS
+
 
 @router.post("/register", response_model=Token)
 async def register(
     data: UserCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    result = await db.execute(select(User).where(User.email == data.email))
-    if result.scalar_one_or_none():
+    role_ids = set(data.role_ids)
+    if role_ids and await db.scalar(select(func.count()).where(Role.id.in_(role_ids))) != len(role_ids):
+        raise HTTPException(status_code=400, detail="Invalid role")
+    try:
+        user = await create_user(db, data)
+    except IntegrityError as e:
+        await db.rollback()
+        if not _is_duplicate_email(e):
+            raise
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = await create_user(db, data)
-    await db.refresh(user)
-    from sqlalchemy.orm import selectinload
-    from app.models.user import UserRole
-    await db.execute(
+    user = await db.scalar(
         select(User)
         .where(User.id == user.id)
-        .options(selectinload(User.user_roles).selectinload(UserRole.role))
+        .options(joinedload(User.user_roles).joinedload(UserRole.role))
     )
-    user = (await db.execute(select(User).where(User.id == user.id).options(selectinload(User.user_roles).selectinload(UserRole.role)))).scalar_one()
     token = create_access_token(data={"sub": str(user.id)})
     return Token(access_token=token, user=user_to_response(user))
 
@@ -47,14 +59,5 @@ async def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
-    from sqlalchemy.orm import selectinload
-    from app.models.user import UserRole
-    await db.refresh(user)
-    result = await db.execute(
-        select(User)
-        .where(User.id == user.id)
-        .options(selectinload(User.user_roles).selectinload(UserRole.role))
-    )
-    user = result.scalar_one()
     token = create_access_token(data={"sub": str(user.id)})
     return Token(access_token=token, user=user_to_response(user))
@@ -2,52 +2,60 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.deps import get_current_user, get_user_roles
+from app.auth.deps import UserSnapshot, get_current_user, get_user_roles
 from app.auth.rbac import can_edit_team
 from app.database import get_db
 from app.models.bu_rate import RoleDefaultRate
-from app.models.user import User
 from app.schemas.bu_rate import (
     RoleDefaultRateCreate,
     RoleDefaultRateResponse,
     RoleDefaultRateUpdate,
 )
+from app.services import bu_rate_cache
 
 router = APIRouter(prefix="/settings", tags=["bu-rates"])
 
+_rate_list_adapter = TypeAdapter(list[RoleDefaultRateResponse])
+
 
 @router.get("/bu-rates", response_model=list[RoleDefaultRateResponse])
 async def list_bu_rates(
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
-    result = await db.execute(select(RoleDefaultRate).order_by(RoleDefaultRate.role))
-    return [RoleDefaultRateResponse.model_validate(r) for r in result.scalars().all()]
+    rates = (await db.scalars(select(RoleDefaultRate).order_by(RoleDefaultRate.role))).all()
+    return _rate_list_adapter.validate_python(rates, from_attributes=True)
 
 
 @router.post("/bu-rates", response_model=RoleDefaultRateResponse)
 async def create_bu_rate(
     data: RoleDefaultRateCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_edit_team(roles):
         raise HTTPException(status_code=403, detail="Cannot manage BU rates")
-    existing = await db.execute(select(RoleDefaultRate).where(RoleDefaultRate.role == data.role))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Role already has default rate")
-    rate = RoleDefaultRate(
-        role=data.role,
-        cost_rate_per_day=data.cost_rate_per_day,
-        billing_rate_per_day=data.billing_rate_per_day,
+    # role is unique; a conflicting insert returns no row instead of raising
+    rate = await db.scalar(
+        pg_insert(RoleDefaultRate)
+        .values(
+            role=data.role,
+            cost_rate_per_day=data.cost_rate_per_day,
+            billing_rate_per_day=data.billing_rate_per_day,
+        )
+        .on_conflict_do_nothing(index_elements=["role"])
+        .returning(RoleDefaultRate)
     )
-    db.add(rate)
-    await db.flush()
-    await db.refresh(rate)
+    if rate is None:
+        raise HTTPException(status_code=400, detail="Role already has default rate")
+    await db.commit()
+    bu_rate_cache.invalidate()
     return RoleDefaultRateResponse.model_validate(rate)
 
 
@@ -56,7 +64,7 @@ async def update_bu_rate(
     rate_id: int,
     data: RoleDefaultRateUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_edit_team(roles):
@@ -66,7 +74,8 @@ async def update_bu_rate(
         raise HTTPException(status_code=404, detail="Rate not found")
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(rate, k, v)
-    await db.refresh(rate)
+    await db.commit()
+    bu_rate_cache.invalidate()
     return RoleDefaultRateResponse.model_validate(rate)
 
 
@@ -74,7 +83,7 @@ async def update_bu_rate(
 async def delete_bu_rate(
     rate_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_edit_team(roles):
@@ -83,4 +92,6 @@ async def delete_bu_rate(
     if not rate:
         raise HTTPException(status_code=404, detail="Rate not found")
     await db.delete(rate)
+    await db.commit()
+    bu_rate_cache.invalidate()
     return None
@@ -3,20 +3,20 @@ from decimal import Decimal
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.auth.deps import get_current_user
+from app.auth.deps import UserSnapshot, get_current_user
 from app.database import get_db
+from app.engine.cache import cost_and_revenue
 from app.engine.calculator import CalculationEngine
-from app.models.bu_rate import RoleDefaultRate
 from app.models.feature import Feature
 from app.models.project import Project, ProjectVersion, RevenueModel
 from app.models.team import TeamMember
-from app.models.user import User
 from app.models.sprint_plan import SprintPlanRow
+from app.queries.version import get_latest_version
 from app.schemas.calculation import (
+    CalculationSummary,
     CostBreakdown,
     ProfitabilityBreakdown,
     RevenueBreakdown,
@@ -24,53 +24,80 @@ from app.schemas.calculation import (
     SprintAllocation,
     SprintPlanCostBreakdown,
 )
+from app.services import bu_rate_cache
 
 router = APIRouter(prefix="/projects", tags=["calculations"])
 
-
-async def _get_default_rates(db: AsyncSession) -> dict[str, tuple[Decimal, Decimal]]:
-    result = await db.execute(select(RoleDefaultRate))
-    return {r.role.strip(): (r.cost_rate_per_day, r.billing_rate_per_day) for r in result.scalars().all()}
+_ZERO = Decimal(0)
+_ONE = Decimal(1)
+_HUNDRED = Decimal(100)
 
 
 async def _load_version_data(db: AsyncSession, project_id: int, with_sprint_plan: bool = False):
     opts = [
         selectinload(ProjectVersion.team_members),
-        selectinload(ProjectVersion.features).selectinload(Feature.effort_allocations),
-        selectinload(ProjectVersion.sprint_config),
-        selectinload(ProjectVersion.project),
+        selectinload(ProjectVersion.features).joinedload(Feature.effort_allocations),
+        joinedload(ProjectVersion.sprint_config),
+        joinedload(ProjectVersion.project),
     ]
     if with_sprint_plan:
         opts.append(selectinload(ProjectVersion.sprint_plan_rows))
-    result = await db.execute(
-        select(ProjectVersion)
-        .where(ProjectVersion.project_id == project_id)
-        .order_by(ProjectVersion.version_number.desc())
-        .limit(1)
-        .options(*opts)
-    )
-    version = result.scalar_one_or_none()
+    version = await get_latest_version(db, project_id, *opts)
     if not version:
         raise HTTPException(status_code=404, detail="Project not found")
-    project = version.project
-    return version, project
+    effort_allocations = {f.id: f.effort_allocations or () for f in version.features}
+    return version, version.project, effort_allocations
+
+
+def _total_effort(
+    engine: CalculationEngine,
+    version: ProjectVersion,
+    effort_allocations: dict[int, list],
+) -> Decimal:
+    """Feature effort with task contingency, scaled by the version contingency."""
+    effort_with_task_contingency = engine.total_effort_hours_with_task_contingency(
+        version.features,
+        effort_allocations,
+    )
+    contingency_factor = _ONE + (version.contingency_pct or _ZERO) / _HUNDRED
+    return engine._round(effort_with_task_contingency * contingency_factor)
+
+
+def _sprint_allocation(
+    engine: CalculationEngine,
+    version: ProjectVersion,
+    effort_allocations: dict[int, list],
+) -> SprintAllocation:
+    total_effort = _total_effort(engine, version, effort_allocations)
+    capacity = engine.sprint_capacity(
+        version.team_members,
+        version.sprint_config,
+    )
+    sprints = engine.sprints_required(total_effort, capacity)
+    effort_per_sprint = total_effort / sprints if sprints > 0 else _ZERO
+    return SprintAllocation(
+        sprint_capacity_hours=capacity,
+        total_effort_hours=total_effort,
+        sprints_required=sprints,
+        effort_per_sprint=engine._round(effort_per_sprint),
+    )
 
 
 @router.get("/{project_id}/calculations/cost", response_model=CostBreakdown)
 async def get_cost(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
-    version, _ = await _load_version_data(db, project_id)
-    default_rates = await _get_default_rates(db)
+    version, project, effort_allocations = await _load_version_data(db, project_id)
+    default_rates = await bu_rate_cache.get_default_rates(db)
     engine = CalculationEngine()
-    effort_allocations = {}
-    for f in version.features:
-        effort_allocations[f.id] = list(f.effort_allocations) if f.effort_allocations else []
-    base_cost = engine.base_cost(
-        list(version.team_members),
-        list(version.features),
+    base_cost, _ = cost_and_revenue(
+        engine,
+        version,
+        project,
+        version.team_members,
+        version.features,
         effort_allocations,
         default_rates,
     )
@@ -92,25 +119,23 @@ async def get_cost(
 async def get_revenue(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
-    version, project = await _load_version_data(db, project_id)
-    default_rates = await _get_default_rates(db)
+    version, project, effort_allocations = await _load_version_data(db, project_id)
+    default_rates = await bu_rate_cache.get_default_rates(db)
     engine = CalculationEngine()
-    effort_allocations = {}
-    for f in version.features:
-        effort_allocations[f.id] = list(f.effort_allocations) if f.effort_allocations else []
-    revenue = engine.revenue(
+    _, revenue = cost_and_revenue(
+        engine,
         version,
         project,
-        list(version.team_members),
-        list(version.features),
+        version.team_members,
+        version.features,
         effort_allocations,
         default_rates,
     )
     return RevenueBreakdown(
         revenue=revenue,
-        revenue_model=project.revenue_model.value if hasattr(project.revenue_model, "value") else str(project.revenue_model),
+        revenue_model=project.revenue_model,
     )
 
 
@@ -118,17 +143,17 @@ async def get_revenue(
 async def get_profitability(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
-    version, project = await _load_version_data(db, project_id)
-    default_rates = await _get_default_rates(db)
+    version, project, effort_allocations = await _load_version_data(db, project_id)
+    default_rates = await bu_rate_cache.get_default_rates(db)
     engine = CalculationEngine()
-    effort_allocations = {}
-    for f in version.features:
-        effort_allocations[f.id] = list(f.effort_allocations) if f.effort_allocations else []
-    base_cost = engine.base_cost(
-        list(version.team_members),
-        list(version.features),
+    base_cost, revenue = cost_and_revenue(
+        engine,
+        version,
+        project,
+        version.team_members,
+        version.features,
         effort_allocations,
         default_rates,
     )
@@ -137,14 +162,6 @@ async def get_profitability(
         version.contingency_pct,
         version.management_reserve_pct,
     )
-    revenue = engine.revenue(
-        version,
-        project,
-        list(version.team_members),
-        list(version.features),
-        effort_allocations,
-        default_rates,
-    )
     gross_margin = engine.gross_margin(revenue, total_cost)
     margin_below = engine.margin_below_threshold(gross_margin) if gross_margin is not None else False
     return ProfitabilityBreakdown(
@@ -160,7 +177,7 @@ async def get_profitability(
 async def get_sprint_allocation(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
     """
     Sprint planning steps:
@@ -169,45 +186,27 @@ async def get_sprint_allocation(
     3. Total sprints = ceil(total_effort / sprint_capacity)
     4. Frontend generates the table with sprints_required rows
     """
-    version, _ = await _load_version_data(db, project_id)
+    version, _, effort_allocations = await _load_version_data(db, project_id)
     engine = CalculationEngine()
-    effort_allocations = {f.id: list(f.effort_allocations or []) for f in version.features}
-    effort_with_task_contingency = engine.total_effort_hours_with_task_contingency(
-        list(version.features),
-        effort_allocations,
-    )
-    contingency_factor = Decimal(1) + (version.contingency_pct or 0) / Decimal(100)
-    total_effort = engine._round(effort_with_task_contingency * contingency_factor)
-    capacity = engine.sprint_capacity(
-        list(version.team_members),
-        version.sprint_config,
-    )
-    sprints = engine.sprints_required(total_effort, capacity)
-    effort_per_sprint = total_effort / sprints if sprints > 0 else Decimal(0)
-    return SprintAllocation(
-        sprint_capacity_hours=capacity,
-        total_effort_hours=total_effort,
-        sprints_required=sprints,
-        effort_per_sprint=engine._round(effort_per_sprint),
-    )
+    return _sprint_allocation(engine, version, effort_allocations)
 
 
 @router.get("/{project_id}/calculations/reverse-margin", response_model=ReverseMarginResult)
 async def reverse_margin(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     target_margin_pct: Decimal = Query(..., ge=0, le=100),
 ):
-    version, project = await _load_version_data(db, project_id)
-    default_rates = await _get_default_rates(db)
+    version, project, effort_allocations = await _load_version_data(db, project_id)
+    default_rates = await bu_rate_cache.get_default_rates(db)
     engine = CalculationEngine()
-    effort_allocations = {}
-    for f in version.features:
-        effort_allocations[f.id] = list(f.effort_allocations) if f.effort_allocations else []
-    base_cost = engine.base_cost(
-        list(version.team_members),
-        list(version.features),
+    base_cost, _ = cost_and_revenue(
+        engine,
+        version,
+        project,
+        version.team_members,
+        version.features,
         effort_allocations,
         default_rates,
     )
@@ -216,13 +215,7 @@ async def reverse_margin(
         version.contingency_pct,
         version.management_reserve_pct,
     )
-    effort_allocations = {f.id: list(f.effort_allocations or []) for f in version.features}
-    effort_with_task = engine.total_effort_hours_with_task_contingency(
-        list(version.features),
-        effort_allocations,
-    )
-    contingency_factor = Decimal(1) + (version.contingency_pct or 0) / Decimal(100)
-    total_effort = engine._round(effort_with_task * contingency_factor)
+    total_effort = _total_effort(engine, version, effort_allocations)
     required_revenue = engine.reverse_margin_revenue(total_cost, target_margin_pct)
     required_billing = engine.reverse_margin_billing_rate(
         total_cost,
@@ -240,11 +233,11 @@ async def reverse_margin(
 async def get_sprint_plan_cost(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
     """Cost from sprint plan allocation: FTE × rate × duration per row."""
-    version, project = await _load_version_data(db, project_id, with_sprint_plan=True)
-    default_rates = await _get_default_rates(db)
+    version, project, _ = await _load_version_data(db, project_id, with_sprint_plan=True)
+    default_rates = await bu_rate_cache.get_default_rates(db)
     engine = CalculationEngine()
     sprint_config = None
     if version.sprint_config:
@@ -258,11 +251,11 @@ async def get_sprint_plan_cost(
     ]
     base, buffer, total = engine.sprint_plan_cost(
         rows,
-        list(version.team_members),
+        version.team_members,
         default_rates,
         sprint_config,
-        version.contingency_pct or Decimal(0),
-        version.management_reserve_pct or Decimal(0),
+        version.contingency_pct or _ZERO,
+        version.management_reserve_pct or _ZERO,
     )
     return SprintPlanCostBreakdown(
         base_cost=base,
@@ -271,3 +264,54 @@ async def get_sprint_plan_cost(
         contingency_pct=version.contingency_pct,
         management_reserve_pct=version.management_reserve_pct,
     )
+
+
+@router.get("/{project_id}/calculations/summary", response_model=CalculationSummary)
+async def get_summary(
+    project_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
+):
+    """Cost, revenue, profitability and sprint allocation from one load and one engine pass."""
+    version, project, effort_allocations = await _load_version_data(db, project_id)
+    default_rates = await bu_rate_cache.get_default_rates(db)
+    engine = CalculationEngine()
+    team_members = version.team_members
+    features = version.features
+    base_cost, revenue = cost_and_revenue(
+        engine,
+        version,
+        project,
+        team_members,
+        features,
+        effort_allocations,
+        default_rates,
+    )
+    base, buffer, total_cost = engine.cost_with_buffers(
+        base_cost,
+        version.contingency_pct,
+        version.management_reserve_pct,
+    )
+    gross_margin = engine.gross_margin(revenue, total_cost)
+    margin_below = engine.margin_below_threshold(gross_margin) if gross_margin is not None else False
+    return CalculationSummary(
+        cost=CostBreakdown(
+            base_cost=base,
+            risk_buffer=buffer,
+            total_cost=total_cost,
+            contingency_pct=version.contingency_pct,
+            management_reserve_pct=version.management_reserve_pct,
+        ),
+        revenue=RevenueBreakdown(
+            revenue=revenue,
+            revenue_model=project.revenue_model,
+        ),
+        profitability=ProfitabilityBreakdown(
+            revenue=revenue,
+            cost=total_cost,
+            gross_margin_pct=gross_margin,
+            net_margin_pct=gross_margin,
+            margin_below_threshold=margin_below,
+        ),
+        sprint=_sprint_allocation(engine, version, effort_allocations),
+    )
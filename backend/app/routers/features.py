@@ -1,60 +1,93 @@
 """Feature API routes."""
+from collections import defaultdict
 from decimal import Decimal
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
-from app.auth.deps import get_current_user, get_user_roles
+from app.auth.deps import UserSnapshot, get_current_user, get_user_roles
 from app.auth.rbac import can_edit_features, can_modify_effort
 from app.config import get_settings
-from app.database import get_db
-from app.models.bu_rate import RoleDefaultRate
+from app.database import get_db, strict_loading
 from app.engine.calculator import CalculationEngine
 from app.models.audit import AuditLog
 from app.models.estimation import EffortAllocation, EstimationHistory, JustificationLog
 from app.models.feature import Feature
 from app.models.project import ProjectVersion
-from app.models.user import User
+from app.queries.version import get_latest_version
+from app.responses import ORJSONResponse
 from app.schemas.feature import (
     AIEstimateRequest,
     AIEstimateResponse,
     EffortAllocationCreate,
+    EffortAllocationResponse,
     FeatureCreate,
     FeatureResponse,
     FeatureTaskResponse,
     FeatureUpdate,
 )
+from app.services import bu_rate_cache
 from app.services.ai_service import compute_fte, estimate_features_from_requirements
 from app.services.document_extractor import extract_text_from_file
 
 router = APIRouter(prefix="/projects", tags=["features"])
 
 
-def _tasks_to_response(tasks: list | None) -> list:
+_FTE_PLACES = Decimal("0.0001")
+
+
+def _to_decimal(value) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _tasks_to_response(tasks: list | None) -> list[dict]:
     if not tasks:
         return []
-    return [
-        FeatureTaskResponse(
-            name=t.get("name", ""),
-            effort_hours=Decimal(str(t.get("effort_hours", 0))),
-            role=t.get("role", "Developer"),
-            fte=Decimal(str(t["fte"])).quantize(Decimal("0.0001")) if t.get("fte") is not None else compute_fte(Decimal(str(t.get("effort_hours", 0)))),
-        )
-        for t in tasks
-    ]
+    out = []
+    for t in tasks:
+        effort = _to_decimal(t.get("effort_hours", 0))
+        fte = t.get("fte")
+        out.append({
+            "name": t.get("name", ""),
+            "effort_hours": effort,
+            "role": t.get("role", "Developer"),
+            "fte": _to_decimal(fte).quantize(_FTE_PLACES) if fte is not None else compute_fte(effort),
+        })
+    return out
 
 
-async def _get_version(db: AsyncSession, project_id: int, require_unlocked: bool = True) -> ProjectVersion:
-    result = await db.execute(
-        select(ProjectVersion)
-        .where(ProjectVersion.project_id == project_id)
-        .order_by(ProjectVersion.version_number.desc())
-        .limit(1)
+def _feature_response(f: Feature, allocations: list[EffortAllocation] | None = None) -> FeatureResponse:
+    """FeatureResponse from a loaded Feature; built without validation since the data comes from the DB.
+
+    Pass allocations when they were just written and f.effort_allocations is stale or unloaded.
+    """
+    if allocations is None:
+        allocations = f.effort_allocations or []
+    return FeatureResponse.model_construct(
+        id=f.id,
+        version_id=f.version_id,
+        name=f.name,
+        description=f.description,
+        priority=f.priority,
+        effort_hours=f.effort_hours,
+        effort_story_points=f.effort_story_points,
+        ai_suggested_effort=f.ai_suggested_effort,
+        ai_suggested_approved=f.ai_suggested_approved,
+        effort_allocations=[
+            EffortAllocationResponse.model_construct(
+                id=a.id, role=a.role, allocation_pct=a.allocation_pct, effort_hours=a.effort_hours, fte=a.fte,
+            )
+            for a in allocations
+        ],
+        tasks=[FeatureTaskResponse.model_construct(**t) for t in _tasks_to_response(f.tasks)],
     )
-    v = result.scalar_one_or_none()
+
+
+async def _get_version(db: AsyncSession, project_id: int, require_unlocked: bool = True) -> ProjectVersion:
+    v = await get_latest_version(db, project_id)
     if not v:
         raise HTTPException(status_code=404, detail="Project not found")
     if require_unlocked and v.is_locked:
@@ -62,35 +95,73 @@ async def _get_version(db: AsyncSession, project_id: int, require_unlocked: bool
     return v
 
 
-@router.get("/{project_id}/features", response_model=list[FeatureResponse])
+def _latest_version_subq(project_id: int):
+    return (
+        select(ProjectVersion.id)
+        .where(ProjectVersion.project_id == project_id)
+        .order_by(ProjectVersion.version_number.desc())
+        .limit(1)
+        .correlate(None)
+        .scalar_subquery()
+    )
+
+
+async def _get_feature(
+    db: AsyncSession,
+    project_id: int,
+    feature_id: int,
+    *options,
+) -> tuple[Feature, ProjectVersion]:
+    """Feature in the project's latest (unlocked) version, fetched together with the version."""
+    result = await db.execute(
+        select(Feature, ProjectVersion)
+        .join(ProjectVersion, Feature.version_id == ProjectVersion.id)
+        .where(Feature.id == feature_id, ProjectVersion.id == _latest_version_subq(project_id))
+        .options(*options)
+    )
+    row = result.unique().first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Feature not found")
+    feature, version = row
+    if version.is_locked:
+        raise HTTPException(status_code=400, detail="Version is locked")
+    return feature, version
+
+
+@router.get(
+    "/{project_id}/features",
+    response_model=None,
+    responses={200: {"model": list[FeatureResponse]}},  # documents the schema; the handler serializes itself
+)
 async def list_features(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
     version = await _get_version(db, project_id, require_unlocked=False)
     result = await db.execute(
         select(Feature)
         .where(Feature.version_id == version.id)
-        .options(selectinload(Feature.effort_allocations))
+        .options(joinedload(Feature.effort_allocations), *strict_loading())
     )
-    features = result.scalars().all()
-    return [
-        FeatureResponse(
-            id=f.id,
-            version_id=f.version_id,
-            name=f.name,
-            description=f.description,
-            priority=f.priority,
-            effort_hours=f.effort_hours,
-            effort_story_points=f.effort_story_points,
-            ai_suggested_effort=f.ai_suggested_effort,
-            ai_suggested_approved=f.ai_suggested_approved,
-            effort_allocations=[{"id": a.id, "role": a.role, "allocation_pct": a.allocation_pct, "effort_hours": a.effort_hours, "fte": a.fte} for a in (f.effort_allocations or [])],
-            tasks=_tasks_to_response(f.tasks),
-        )
+    features = result.unique().scalars().all()
+    # Built from trusted DB rows and serialized directly, without re-validating through FeatureResponse
+    return ORJSONResponse([
+        {
+            "id": f.id,
+            "version_id": f.version_id,
+            "name": f.name,
+            "description": f.description,
+            "priority": f.priority,
+            "effort_hours": f.effort_hours,
+            "effort_story_points": f.effort_story_points,
+            "ai_suggested_effort": f.ai_suggested_effort,
+            "ai_suggested_approved": f.ai_suggested_approved,
+            "effort_allocations": [{"id": a.id, "role": a.role, "allocation_pct": a.allocation_pct, "effort_hours": a.effort_hours, "fte": a.fte} for a in (f.effort_allocations or [])],
+            "tasks": _tasks_to_response(f.tasks),
+        }
         for f in features
-    ]
+    ])
 
 
 @router.post("/{project_id}/features", response_model=FeatureResponse)
@@ -98,7 +169,7 @@ async def add_feature(
     project_id: int,
     data: FeatureCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_edit_features(roles):
@@ -124,15 +195,22 @@ async def add_feature(
     )
     db.add(feature)
     await db.flush()
-    for a in data.effort_allocations:
-        fte_val = a.fte if a.fte is not None else compute_fte(a.effort_hours)
-        db.add(EffortAllocation(
-            feature_id=feature.id,
-            role=a.role,
-            allocation_pct=a.allocation_pct,
-            effort_hours=a.effort_hours,
-            fte=fte_val,
-        ))
+    allocations = []
+    if data.effort_allocations:
+        result = await db.scalars(
+            insert(EffortAllocation).returning(EffortAllocation),
+            [
+                {
+                    "feature_id": feature.id,
+                    "role": a.role,
+                    "allocation_pct": a.allocation_pct,
+                    "effort_hours": a.effort_hours,
+                    "fte": a.fte if a.fte is not None else compute_fte(a.effort_hours),
+                }
+                for a in data.effort_allocations
+            ],
+        )
+        allocations = result.all()
     db.add(AuditLog(
         project_id=project_id,
         version_id=version.id,
@@ -142,31 +220,23 @@ async def add_feature(
         entity_id=feature.id,
         new_value=data.name,
     ))
-    await db.refresh(feature)
-    result = await db.execute(
-        select(Feature)
-        .where(Feature.id == feature.id)
-        .options(selectinload(Feature.effort_allocations))
-    )
-    f = result.scalar_one()
-    return FeatureResponse(
-        id=f.id,
-        version_id=f.version_id,
-        name=f.name,
-        description=f.description,
-        priority=f.priority,
-        effort_hours=f.effort_hours,
-        effort_story_points=f.effort_story_points,
-        ai_suggested_effort=f.ai_suggested_effort,
-        ai_suggested_approved=f.ai_suggested_approved,
-        effort_allocations=[{"id": a.id, "role": a.role, "allocation_pct": a.allocation_pct, "effort_hours": a.effort_hours, "fte": a.fte} for a in (f.effort_allocations or [])],
-        tasks=_tasks_to_response(f.tasks),
-    )
+    return _feature_response(feature, allocations)
+
+
+_UPLOAD_CHUNK = 1 << 20
 
 
-async def _get_bu_role_names(db: AsyncSession) -> list[str]:
-    result = await db.execute(select(RoleDefaultRate.role).order_by(RoleDefaultRate.role))
-    return [str(r[0]).strip() for r in result.all() if r[0]]
+async def _read_upload(file: UploadFile, limit: int) -> bytes:
+    """Read an upload in chunks, rejecting it with 413 as soon as it exceeds limit bytes."""
+    buf = bytearray()
+    while chunk := await file.read(_UPLOAD_CHUNK):
+        buf += chunk
+        if len(buf) > limit:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {limit // (1024 * 1024)} MB.",
+            )
+    return bytes(buf)
 
 
 @router.post("/{project_id}/features/ai-estimate", response_model=AIEstimateResponse)
@@ -174,15 +244,15 @@ async def ai_estimate(
     project_id: int,
     data: AIEstimateRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_edit_features(roles):
         raise HTTPException(status_code=403, detail="Cannot edit features")
     await _get_version(db, project_id)
-    bu_role_names = await _get_bu_role_names(db)
+    bu_role_names = await bu_rate_cache.get_role_names(db)
     features, raw = await estimate_features_from_requirements(data.requirement_text, bu_role_names)
-    return AIEstimateResponse(features=features, raw_suggestion=raw)
+    return AIEstimateResponse.model_construct(features=features, raw_suggestion=raw)
 
 
 @router.post("/{project_id}/features/ai-estimate-upload", response_model=AIEstimateResponse)
@@ -190,23 +260,23 @@ async def ai_estimate_from_upload(
     project_id: int,
     file: Annotated[UploadFile, File()],
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     """Upload requirement doc (PDF, DOCX, TXT) and get AI-suggested features with effort."""
     if not can_edit_features(roles):
         raise HTTPException(status_code=403, detail="Cannot edit features")
     await _get_version(db, project_id)
-    content = await file.read()
+    content = await _read_upload(file, get_settings().max_upload_bytes)
     try:
-        requirement_text = extract_text_from_file(content, file.filename or "document")
+        requirement_text = await extract_text_from_file(content, file.filename or "document")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not requirement_text.strip():
         raise HTTPException(status_code=400, detail="Could not extract text from document")
-    bu_role_names = await _get_bu_role_names(db)
+    bu_role_names = await bu_rate_cache.get_role_names(db)
     features, raw = await estimate_features_from_requirements(requirement_text, bu_role_names)
-    return AIEstimateResponse(features=features, raw_suggestion=raw)
+    return AIEstimateResponse.model_construct(features=features, raw_suggestion=raw)
 
 
 @router.patch("/{project_id}/features/{feature_id}", response_model=FeatureResponse)
@@ -215,26 +285,22 @@ async def update_feature(
     feature_id: int,
     data: FeatureUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
     justification: str | None = None,
 ):
-    version = await _get_version(db, project_id)
-    result = await db.execute(
-        select(Feature)
-        .where(Feature.id == feature_id, Feature.version_id == version.id)
-        .options(selectinload(Feature.effort_allocations))
+    edit_ok = can_edit_features(roles)
+    effort_ok = can_modify_effort(roles)  # admin or technical_architect
+    feature, version = await _get_feature(
+        db, project_id, feature_id, joinedload(Feature.effort_allocations), *strict_loading()
     )
-    feature = result.scalar_one_or_none()
-    if not feature:
-        raise HTTPException(status_code=404, detail="Feature not found")
 
     if data.effort_hours is not None:
-        if not can_modify_effort(roles) and not can_edit_features(roles):
+        if not effort_ok and not edit_ok:
             raise HTTPException(status_code=403, detail="Cannot modify effort")
         engine = CalculationEngine()
         if engine.effort_override_exceeds_threshold(feature.effort_hours, data.effort_hours):
-            if "technical_architect" not in [r.lower() for r in roles] and "admin" not in [r.lower() for r in roles]:
+            if not effort_ok:
                 raise HTTPException(
                     status_code=403,
                     detail="Effort change >15% requires Technical Architect approval",
@@ -258,10 +324,10 @@ async def update_feature(
             previous_effort=feature.effort_hours,
             new_effort=data.effort_hours,
             changed_by=user.id,
-            authority="technical_architect" if can_modify_effort(roles) else "business_analyst",
+            authority="technical_architect" if effort_ok else "business_analyst",
         ))
         feature.effort_hours = data.effort_hours
-    elif not can_edit_features(roles):
+    elif not edit_ok:
         raise HTTPException(status_code=403, detail="Cannot edit features")
 
     if data.name is not None:
@@ -272,18 +338,18 @@ async def update_feature(
         feature.priority = data.priority
     if data.effort_story_points is not None:
         feature.effort_story_points = data.effort_story_points
+    new_allocations: list[dict] | None = None
     if data.effort_allocations is not None:
-        for a in feature.effort_allocations or []:
-            await db.delete(a)
-        for a in data.effort_allocations:
-            fte_val = a.fte if a.fte is not None else compute_fte(a.effort_hours)
-            db.add(EffortAllocation(
-                feature_id=feature.id,
-                role=a.role,
-                allocation_pct=a.allocation_pct,
-                effort_hours=a.effort_hours,
-                fte=fte_val,
-            ))
+        new_allocations = [
+            {
+                "feature_id": feature.id,
+                "role": a.role,
+                "allocation_pct": a.allocation_pct,
+                "effort_hours": a.effort_hours,
+                "fte": a.fte if a.fte is not None else compute_fte(a.effort_hours),
+            }
+            for a in data.effort_allocations
+        ]
     if data.tasks is not None:
         feature.tasks = [
             {
@@ -294,24 +360,28 @@ async def update_feature(
             }
             for t in data.tasks
         ]
-        role_hours: dict[str, Decimal] = {}
+        role_hours: defaultdict[str, Decimal] = defaultdict(Decimal)
         for t in data.tasks:
-            r = (t.role or "").strip() or "Unassigned"
-            role_hours[r] = role_hours.get(r, Decimal(0)) + t.effort_hours
+            role_hours[(t.role or "").strip() or "Unassigned"] += t.effort_hours
         total_hrs = sum(role_hours.values()) or Decimal(1)
-        for a in list(feature.effort_allocations or []):
-            await db.delete(a)
-        for role, hrs in role_hours.items():
-            pct = (hrs / total_hrs * 100).quantize(Decimal("0.01"))
-            db.add(
-                EffortAllocation(
-                    feature_id=feature.id,
-                    role=role,
-                    allocation_pct=pct,
-                    effort_hours=hrs,
-                    fte=compute_fte(hrs),
-                )
-            )
+        # Allocations derived from tasks take precedence over explicit ones
+        new_allocations = [
+            {
+                "feature_id": feature.id,
+                "role": role,
+                "allocation_pct": (hrs / total_hrs * 100).quantize(Decimal("0.01")),
+                "effort_hours": hrs,
+                "fte": compute_fte(hrs),
+            }
+            for role, hrs in role_hours.items()
+        ]
+    allocations = None
+    if new_allocations is not None:
+        await db.execute(delete(EffortAllocation).where(EffortAllocation.feature_id == feature.id))
+        allocations = []
+        if new_allocations:
+            result = await db.scalars(insert(EffortAllocation).returning(EffortAllocation), new_allocations)
+            allocations = result.all()
 
     db.add(AuditLog(
         project_id=project_id,
@@ -321,26 +391,9 @@ async def update_feature(
         entity_type="feature",
         entity_id=feature.id,
     ))
-    await db.refresh(feature)
-    result = await db.execute(
-        select(Feature)
-        .where(Feature.id == feature.id)
-        .options(selectinload(Feature.effort_allocations))
-    )
-    f = result.scalar_one()
-    return FeatureResponse(
-        id=f.id,
-        version_id=f.version_id,
-        name=f.name,
-        description=f.description,
-        priority=f.priority,
-        effort_hours=f.effort_hours,
-        effort_story_points=f.effort_story_points,
-        ai_suggested_effort=f.ai_suggested_effort,
-        ai_suggested_approved=f.ai_suggested_approved,
-        effort_allocations=[{"id": a.id, "role": a.role, "allocation_pct": a.allocation_pct, "effort_hours": a.effort_hours, "fte": a.fte} for a in (f.effort_allocations or [])],
-        tasks=_tasks_to_response(f.tasks),
-    )
+    # Surface constraint errors here rather than at the commit in get_db
+    await db.flush()
+    return _feature_response(feature, allocations)
 
 
 @router.delete("/{project_id}/features/{feature_id}")
@@ -348,16 +401,12 @@ async def delete_feature(
     project_id: int,
     feature_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_edit_features(roles):
         raise HTTPException(status_code=403, detail="Cannot edit features")
-    version = await _get_version(db, project_id)
-    result = await db.execute(select(Feature).where(Feature.id == feature_id, Feature.version_id == version.id))
-    feature = result.scalar_one_or_none()
-    if not feature:
-        raise HTTPException(status_code=404, detail="Feature not found")
+    feature, version = await _get_feature(db, project_id, feature_id)
     await db.delete(feature)
     db.add(AuditLog(
         project_id=project_id,
@@ -6,12 +6,12 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.auth.deps import get_current_user, get_user_roles
+from app.auth.deps import UserSnapshot, get_current_user, get_user_roles
 from app.auth.rbac import can_create_project, can_delete_project
 from app.database import get_db
 from app.models.audit import AuditLog
 from app.models.project import Project, ProjectVersion, ProjectStatus, RevenueModel, SprintConfig
-from app.models.user import User
+from app.queries.version import get_latest_version
 from app.schemas.project import ProjectCreate, ProjectResponse
 
 router = APIRouter(prefix="/projects", tags=["projects"])
@@ -21,7 +21,7 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 async def create_project(
     data: ProjectCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_create_project(roles):
@@ -32,7 +32,7 @@ async def create_project(
     project = Project(
         name=data.name,
         client_name=data.client_name,
-        revenue_model=RevenueModel(data.revenue_model),
+        revenue_model=RevenueModel(data.revenue_model).value,
         currency=data.currency.upper(),
         sprint_duration_weeks=data.sprint_duration_weeks,
         project_duration_months=data.project_duration_months,
@@ -45,7 +45,7 @@ async def create_project(
     version = ProjectVersion(
         project_id=project.id,
         version_number=1,
-        status=ProjectStatus.DRAFT,
+        status=ProjectStatus.DRAFT.value,
         created_by=user.id,
     )
     db.add(version)
@@ -79,7 +79,7 @@ async def create_project(
 async def get_project(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
     project = await db.get(Project, project_id)
     if not project:
@@ -88,7 +88,7 @@ async def get_project(
         id=project.id,
         name=project.name,
         client_name=project.client_name,
-        revenue_model=project.revenue_model.value if hasattr(project.revenue_model, "value") else str(project.revenue_model),
+        revenue_model=project.revenue_model,
         currency=project.currency,
         sprint_duration_weeks=project.sprint_duration_weeks,
         project_duration_months=project.project_duration_months,
@@ -103,7 +103,7 @@ async def get_project(
 async def delete_project(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     if not can_delete_project(roles):
@@ -114,13 +114,7 @@ async def delete_project(
     project = result.scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    version_result = await db.execute(
-        select(ProjectVersion)
-        .where(ProjectVersion.project_id == project_id)
-        .order_by(ProjectVersion.version_number.desc())
-        .limit(1)
-    )
-    version = version_result.scalar_one_or_none()
+    version = await get_latest_version(db, project_id)
     if not version:
         raise HTTPException(status_code=404, detail="Project not found")
     if version.status != ProjectStatus.DRAFT or version.is_locked:
@@ -1,142 +1,180 @@
 """Repository and dashboard API routes."""
-from decimal import Decimal
+import asyncio
+from collections import Counter
+from decimal import ROUND_HALF_UP, Decimal
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from sqlalchemy import and_, false, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.auth.deps import get_current_user
-from app.database import get_db
+from app.auth.deps import UserSnapshot, get_current_user
+from app.database import get_db, strict_loading
 from app.engine.calculator import CalculationEngine
-from app.models.bu_rate import RoleDefaultRate
 from app.models.feature import Feature
 from app.models.project import Project, ProjectVersion, ProjectStatus, RevenueModel
 from app.models.team import TeamMember
-from app.models.user import User
+from app.responses import ORJSONResponse
+from app.services import bu_rate_cache
 
 router = APIRouter(prefix="/repository", tags=["repository"])
 
 
-async def _get_default_rates(db: AsyncSession) -> dict[str, tuple[Decimal, Decimal]]:
-    result = await db.execute(select(RoleDefaultRate))
-    return {r.role.strip(): (r.cost_rate_per_day, r.billing_rate_per_day) for r in result.scalars().all()}
+def _projects_with_latest_version():
+    """Projects paired with their latest version (None if they have none), inputs eager-loaded."""
+    latest = (
+        select(ProjectVersion.project_id, func.max(ProjectVersion.version_number).label("vn"))
+        .group_by(ProjectVersion.project_id)
+        .subquery()
+    )
+    return (
+        select(Project, ProjectVersion)
+        .outerjoin(latest, latest.c.project_id == Project.id)
+        .outerjoin(
+            ProjectVersion,
+            and_(
+                ProjectVersion.project_id == latest.c.project_id,
+                ProjectVersion.version_number == latest.c.vn,
+            ),
+        )
+        .options(
+            selectinload(ProjectVersion.team_members),
+            # selectin at the widest level, joins for the small per-feature/per-version children
+            selectinload(ProjectVersion.features).joinedload(Feature.effort_allocations),
+            joinedload(ProjectVersion.sprint_config),
+            *strict_loading(),
+        )
+    )
+
+
+_NO_COST = Decimal("0.00")
+_CENT = Decimal("0.01")
+
+
+def _revenue_and_cost(
+    engine: CalculationEngine,
+    p: Project,
+    v: ProjectVersion,
+    default_rates: dict[str, tuple[Decimal, Decimal]],
+) -> tuple[Decimal, Decimal]:
+    """Revenue and buffered cost of a loaded version."""
+    if not v.features:
+        # No effort means no cost whatever the team; only a fixed price can still give revenue
+        return engine.revenue(v, p, v.team_members, (), {}, default_rates), _NO_COST
+    effort_alloc = {f.id: f.effort_allocations or () for f in v.features}
+    base = engine.base_cost(v.team_members, v.features, effort_alloc, default_rates)
+    _, _, cost = engine.cost_with_buffers(base, v.contingency_pct, v.management_reserve_pct)
+    revenue = engine.revenue(v, p, v.team_members, v.features, effort_alloc, default_rates)
+    return revenue, cost
+
+
+def _status_filter(status: str):
+    """WHERE clause matching the status list_projects reports: no version or no status is draft, locked is won."""
+    status = status.lower()
+    if status == ProjectStatus.DRAFT.value:
+        return or_(
+            ProjectVersion.id.is_(None),
+            ProjectVersion.status.is_(None),
+            ProjectVersion.status.in_(("", ProjectStatus.DRAFT.value)),
+        )
+    if status == ProjectStatus.WON.value:
+        return ProjectVersion.status.in_((ProjectStatus.WON.value, ProjectStatus.LOCKED.value))
+    if status == ProjectStatus.LOCKED.value:
+        return false()  # legacy value, always reported as won
+    return ProjectVersion.status == status
 
 
 @router.get("/projects")
 async def list_projects(
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     search: str | None = Query(None),
     status: str | None = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
 ):
-    q = select(Project).order_by(Project.created_at.desc())
+    q = _projects_with_latest_version().order_by(Project.created_at.desc())
     if search:
         q = q.where(Project.name.ilike(f"%{search}%") | Project.client_name.ilike(f"%{search}%"))
+    if status:
+        # Filter before offset/limit so pages stay full and skipped rows cost no engine work
+        q = q.where(_status_filter(status))
     q = q.offset(skip).limit(limit)
     result = await db.execute(q)
-    projects = result.scalars().all()
+    default_rates = await bu_rate_cache.get_default_rates(db)
+    engine = CalculationEngine()
     items = []
-    for p in projects:
-        v_result = await db.execute(
-            select(ProjectVersion)
-            .where(ProjectVersion.project_id == p.id)
-            .order_by(ProjectVersion.version_number.desc())
-            .limit(1)
-            .options(
-                selectinload(ProjectVersion.team_members),
-                selectinload(ProjectVersion.features).selectinload(Feature.effort_allocations),
-                selectinload(ProjectVersion.sprint_config),
-                selectinload(ProjectVersion.project),
-            )
-        )
-        v = v_result.scalar_one_or_none()
+    for p, v in result.all():
         revenue = cost = margin = None
         v_status = "draft"
         if v:
-            default_rates = await _get_default_rates(db)
-            engine = CalculationEngine()
-            effort_alloc = {f.id: list(f.effort_allocations or []) for f in v.features}
-            base = engine.base_cost(list(v.team_members), list(v.features), effort_alloc, default_rates)
-            _, _, cost = engine.cost_with_buffers(base, v.contingency_pct, v.management_reserve_pct)
-            revenue = engine.revenue(v, p, list(v.team_members), list(v.features), effort_alloc, default_rates)
+            revenue, cost = _revenue_and_cost(engine, p, v, default_rates)
             margin = engine.gross_margin(revenue, cost)
-            v_status = (v.status.value if hasattr(v.status, "value") else v.status) or "draft"
+            v_status = v.status or "draft"
             if v_status == "locked":
                 v_status = "won"  # legacy
-        if status and status.lower() != v_status.lower():
-            continue
         items.append({
             "id": p.id,
             "name": p.name,
             "client_name": p.client_name,
             "currency": p.currency,
-            "revenue_model": p.revenue_model.value if hasattr(p.revenue_model, "value") else str(p.revenue_model),
+            "revenue_model": p.revenue_model,
             "created_by": p.created_by,
             "created_at": p.created_at.isoformat() if p.created_at else None,
             "status": v_status if v else "draft",
-            "revenue": float(revenue) if revenue is not None else None,
-            "cost": float(cost) if cost is not None else None,
-            "margin_pct": float(margin) if margin is not None else None,
+            # Decimals (or None) are rendered as strings by ORJSONResponse
+            "revenue": revenue,
+            "cost": cost,
+            "margin_pct": margin,
         })
-    return {"items": items, "total": len(items)}
+    return ORJSONResponse({"items": items, "total": len(items)})
 
 
-@router.get("/dashboard")
-async def get_dashboard(
-    db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
-):
-    result = await db.execute(select(Project))
-    projects = result.scalars().all()
+def _compute_dashboard(
+    rows: list[tuple[Project, ProjectVersion]],
+    default_rates: dict[str, tuple[Decimal, Decimal]],
+) -> dict:
+    """Aggregate dashboard figures from fully loaded (project, version) pairs. Does no I/O."""
     total_revenue = Decimal(0)
     total_cost = Decimal(0)
     margins = []
-    project_count = 0
     below_threshold = 0
     engine = CalculationEngine()
-    role_usage = {}
-    default_rates = await _get_default_rates(db)
-
-    for p in projects:
-        v_result = await db.execute(
-            select(ProjectVersion)
-            .where(ProjectVersion.project_id == p.id)
-            .order_by(ProjectVersion.version_number.desc())
-            .limit(1)
-            .options(
-                selectinload(ProjectVersion.team_members),
-                selectinload(ProjectVersion.features).selectinload(Feature.effort_allocations),
-                selectinload(ProjectVersion.project),
-            )
-        )
-        v = v_result.scalar_one_or_none()
-        if not v:
-            continue
-        project_count += 1
-        effort_alloc = {f.id: list(f.effort_allocations or []) for f in v.features}
-        base = engine.base_cost(list(v.team_members), list(v.features), effort_alloc, default_rates)
-        _, _, cost = engine.cost_with_buffers(base, v.contingency_pct, v.management_reserve_pct)
-        revenue = engine.revenue(v, p, list(v.team_members), list(v.features), effort_alloc, default_rates)
+    role_usage = Counter()
+
+    for p, v in rows:
+        revenue, cost = _revenue_and_cost(engine, p, v, default_rates)
         total_revenue += revenue
         total_cost += cost
         margin = engine.gross_margin(revenue, cost)
         if margin is not None:
-            margins.append(float(margin))
+            margins.append(margin)
             if engine.margin_below_threshold(margin):
                 below_threshold += 1
-        for m in v.team_members:
-            role_usage[m.role] = role_usage.get(m.role, 0) + 1
+        role_usage.update(m.role for m in v.team_members)
 
-    avg_margin = sum(margins) / len(margins) if margins else 0
+    avg_margin = sum(margins, Decimal(0)) / len(margins) if margins else Decimal(0)
     return {
-        "total_simulated_revenue": float(total_revenue),
-        "total_simulated_cost": float(total_cost),
-        "avg_margin_pct": round(avg_margin, 2),
-        "project_count": project_count,
+        "total_simulated_revenue": total_revenue,
+        "total_simulated_cost": total_cost,
+        "avg_margin_pct": avg_margin.quantize(_CENT, rounding=ROUND_HALF_UP),
+        "project_count": len(rows),
         "projects_below_threshold": below_threshold,
-        "top_roles": sorted(role_usage.items(), key=lambda x: -x[1])[:10],
+        # most_common(n) is a heapq.nlargest selection, not a full sort; ties keep first-seen order
+        "top_roles": role_usage.most_common(10),
     }
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
+):
+    result = await db.execute(_projects_with_latest_version().where(ProjectVersion.id.is_not(None)))
+    rows = result.tuples().all()
+    default_rates = await bu_rate_cache.get_default_rates(db)
+    # Engine work is pure CPU over already-loaded objects; keep it off the event loop
+    data = await asyncio.to_thread(_compute_dashboard, rows, default_rates)
+    # Returned directly: FastAPI's jsonable_encoder would turn the Decimals into floats
+    return ORJSONResponse(data)
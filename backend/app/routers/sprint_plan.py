@@ -2,29 +2,24 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.deps import get_current_user, get_user_roles
 from app.auth.rbac import can_edit_team, can_edit_features
 from app.database import get_db
-from app.models.bu_rate import RoleDefaultRate
 from app.models.project import ProjectVersion
 from app.models.sprint_plan import SprintPlanRow
 from app.models.team import TeamMember
+from app.queries.version import get_latest_version
 from app.schemas.sprint_plan import SprintPlanRowSchema, SprintPlanSchema, SprintPlanUpdate
+from app.services import bu_rate_cache
 
 router = APIRouter(prefix="/projects", tags=["sprint-plan"])
 
 
 async def _get_version(db: AsyncSession, project_id: int, require_unlocked: bool = True) -> ProjectVersion:
-    result = await db.execute(
-        select(ProjectVersion)
-        .where(ProjectVersion.project_id == project_id)
-        .order_by(ProjectVersion.version_number.desc())
-        .limit(1)
-    )
-    version = result.scalar_one_or_none()
+    version = await get_latest_version(db, project_id)
     if not version:
         raise HTTPException(status_code=404, detail="Project not found")
     if require_unlocked and version.is_locked:
@@ -66,8 +61,7 @@ async def get_sprint_plan(
     team = team_result.scalars().all()
     roles = list(dict.fromkeys(m.role for m in team))
     if not roles:
-        bu_result = await db.execute(select(RoleDefaultRate.role).order_by(RoleDefaultRate.role))
-        roles = list(bu_result.scalars().all())
+        roles = await bu_rate_cache.get_role_names(db)
     if rows:
         schema_rows = [_row_to_schema(r) for r in rows]
         all_roles = set(roles)
@@ -94,17 +88,21 @@ async def save_sprint_plan(
         raise HTTPException(status_code=403, detail="Cannot edit sprint plan")
     version = await _get_version(db, project_id)
     await db.execute(delete(SprintPlanRow).where(SprintPlanRow.version_id == version.id))
-    for i, row in enumerate(data.rows):
-        db_row = SprintPlanRow(
-            version_id=version.id,
-            row_type=row.type,
-            sprint_num=row.sprint_num,
-            week_num=row.week_num,
-            phase=row.phase,
-            allocations=dict(row.values),
-            sort_order=i,
+    if data.rows:
+        await db.execute(
+            insert(SprintPlanRow),
+            [
+                {
+                    "version_id": version.id,
+                    "row_type": row.type,
+                    "sprint_num": row.sprint_num,
+                    "week_num": row.week_num,
+                    "phase": row.phase,
+                    "allocations": row.values,
+                    "sort_order": i,
+                }
+                for i, row in enumerate(data.rows)
+            ],
         )
-        db.add(db_row)
-    await db.flush()
     await db.commit()
     return SprintPlanSchema(rows=data.rows, roles=data.roles)
@@ -3,19 +3,19 @@ from decimal import Decimal
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.auth.deps import get_current_user, get_user_roles
-from app.config import get_settings
+from app.auth.deps import UserSnapshot, get_current_user, get_user_roles
 from app.auth.rbac import can_edit_team
+from app.config import get_settings
 from app.database import get_db
 from app.models.audit import AuditLog
-from app.models.bu_rate import RoleDefaultRate
-from app.models.project import Project, ProjectVersion
+from app.models.project import ProjectVersion
 from app.models.team import TeamMember
-from app.models.user import User
-from app.schemas.feature import FeatureCreate
+from app.queries.version import get_latest_version
 from app.schemas.team import (
     AITeamSuggestionRequest,
     AITeamSuggestionResponse,
@@ -23,19 +23,20 @@ from app.schemas.team import (
     TeamMemberResponse,
     TeamMemberUpdate,
 )
+from app.services import bu_rate_cache
 from app.services.ai_service import suggest_team_allocation
 
 router = APIRouter(prefix="/projects", tags=["team"])
+settings = get_settings()
 
+_member_list_adapter = TypeAdapter(list[TeamMemberResponse])
 
-async def _get_version(db: AsyncSession, project_id: int, require_unlocked: bool = True) -> ProjectVersion:
-    result = await db.execute(
-        select(ProjectVersion)
-        .where(ProjectVersion.project_id == project_id)
-        .order_by(ProjectVersion.version_number.desc())
-        .limit(1)
-    )
-    v = result.scalar_one_or_none()
+
+async def _get_version(
+    db: AsyncSession, project_id: int, require_unlocked: bool = True, *options
+) -> ProjectVersion:
+    """Latest version of the project; options are applied to the same query (e.g. to join-load the project)."""
+    v = await get_latest_version(db, project_id, *options)
     if not v:
         raise HTTPException(status_code=404, detail="Project not found")
     if require_unlocked and v.is_locked:
@@ -43,33 +44,43 @@ async def _get_version(db: AsyncSession, project_id: int, require_unlocked: bool
     return v
 
 
+async def require_unlocked_version(
+    project_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    roles: Annotated[list[str], Depends(get_user_roles)],
+) -> ProjectVersion:
+    """Dependency for team mutations: checks edit rights, then returns the unlocked latest version."""
+    if not can_edit_team(roles):
+        raise HTTPException(status_code=403, detail="Cannot edit team")
+    return await _get_version(db, project_id, require_unlocked=True)
+
+
+async def _get_member(db: AsyncSession, version_id: int, member_id: int) -> TeamMember:
+    member = await db.scalar(
+        select(TeamMember).where(TeamMember.id == member_id, TeamMember.version_id == version_id)
+    )
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return member
+
+
 @router.post("/{project_id}/team/ai-suggest", response_model=AITeamSuggestionResponse)
 async def ai_suggest_team(
     project_id: int,
     data: AITeamSuggestionRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     """Suggest realistic team composition based on features. Human-in-loop: user must approve before adding."""
     if not can_edit_team(roles):
         raise HTTPException(status_code=403, detail="Cannot edit team")
-    await _get_version(db, project_id, require_unlocked=True)
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    features = [
-        FeatureCreate(
-            name=item.get("name", "Unnamed"),
-            effort_hours=Decimal(str(item.get("effort_hours", 0))),
-            priority=int(item.get("priority", 1)),
-        )
-        for item in data.features
-    ]
-    total_effort = sum(float(f.effort_hours) for f in features)
+    version = await _get_version(db, project_id, True, joinedload(ProjectVersion.project))
+    project = version.project
+    features = data.features
+    total_effort = float(sum((f.effort_hours for f in features), Decimal(0)))
     members, raw = await suggest_team_allocation(
-        features, total_effort, project.sprint_duration_weeks or get_settings().default_sprint_duration_weeks
+        features, total_effort, project.sprint_duration_weeks or settings.default_sprint_duration_weeks
     )
     return AITeamSuggestionResponse(members=members, raw_suggestion=raw)
 
@@ -78,12 +89,11 @@ async def ai_suggest_team(
 async def list_team(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
     version = await _get_version(db, project_id, require_unlocked=False)
-    result = await db.execute(select(TeamMember).where(TeamMember.version_id == version.id))
-    members = result.scalars().all()
-    return [TeamMemberResponse.model_validate(m) for m in members]
+    members = await db.scalars(select(TeamMember).where(TeamMember.version_id == version.id))
+    return _member_list_adapter.validate_python(members.all(), from_attributes=True)
 
 
 @router.post("/{project_id}/team", response_model=TeamMemberResponse)
@@ -91,24 +101,18 @@ async def add_team_member(
     project_id: int,
     data: TeamMemberCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
-    roles: Annotated[list[str], Depends(get_user_roles)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
+    version: Annotated[ProjectVersion, Depends(require_unlocked_version)],
 ):
-    if not can_edit_team(roles):
-        raise HTTPException(status_code=403, detail="Cannot edit team")
-    version = await _get_version(db, project_id, require_unlocked=True)
     cost_rate = data.cost_rate_per_day
     billing_rate = data.billing_rate_per_day
     if cost_rate is None or billing_rate is None:
-        default_result = await db.execute(
-            select(RoleDefaultRate).where(RoleDefaultRate.role == data.role)
-        )
-        default_row = default_result.scalar_one_or_none()
-        if default_row:
+        default_rate = (await bu_rate_cache.get_default_rates(db)).get(data.role.strip())
+        if default_rate:
             if cost_rate is None:
-                cost_rate = default_row.cost_rate_per_day
+                cost_rate = default_rate[0]
             if billing_rate is None:
-                billing_rate = default_row.billing_rate_per_day
+                billing_rate = default_rate[1]
     member = TeamMember(
         version_id=version.id,
         role=data.role,
@@ -120,7 +124,7 @@ async def add_team_member(
         hours_per_day=data.hours_per_day,
     )
     db.add(member)
-    await db.flush()
+    await db.flush()  # assigns member.id for the audit row; both are already complete in memory
     db.add(AuditLog(
         project_id=project_id,
         version_id=version.id,
@@ -130,7 +134,6 @@ async def add_team_member(
         entity_id=member.id,
         new_value=data.role,
     ))
-    await db.refresh(member)
     return TeamMemberResponse.model_validate(member)
 
 
@@ -140,19 +143,13 @@ async def update_team_member(
     member_id: int,
     data: TeamMemberUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
-    roles: Annotated[list[str], Depends(get_user_roles)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
+    version: Annotated[ProjectVersion, Depends(require_unlocked_version)],
 ):
-    if not can_edit_team(roles):
-        raise HTTPException(status_code=403, detail="Cannot edit team")
-    version = await _get_version(db, project_id, require_unlocked=True)
-    member = await db.get(TeamMember, member_id)
-    if not member or member.version_id != version.id:
-        raise HTTPException(status_code=404, detail="Member not found")
+    member = await _get_member(db, version.id, member_id)
     updates = data.model_dump(exclude_unset=True)
     for k, v in updates.items():
         setattr(member, k, v)
-    await db.flush()
     db.add(AuditLog(
         project_id=project_id,
         version_id=version.id,
@@ -161,7 +158,7 @@ async def update_team_member(
         entity_type="team_member",
         entity_id=member.id,
     ))
-    await db.refresh(member)
+    # The UPDATE and the audit INSERT go out together when get_db commits
     return TeamMemberResponse.model_validate(member)
 
 
@@ -170,22 +167,32 @@ async def delete_team_member(
     project_id: int,
     member_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
-    roles: Annotated[list[str], Depends(get_user_roles)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
+    version: Annotated[ProjectVersion, Depends(require_unlocked_version)],
 ):
-    if not can_edit_team(roles):
-        raise HTTPException(status_code=403, detail="Cannot edit team")
-    version = await _get_version(db, project_id, require_unlocked=True)
-    member = await db.get(TeamMember, member_id)
-    if not member or member.version_id != version.id:
+    # One statement: the CTE deletes the row and the audit INSERT selects from it,
+    # so nothing is written (and we 404) when the member does not exist
+    deleted = (
+        delete(TeamMember)
+        .where(TeamMember.id == member_id, TeamMember.version_id == version.id)
+        .returning(TeamMember.id)
+        .cte("deleted")
+    )
+    audited = await db.scalar(
+        insert(AuditLog)
+        .from_select(
+            ["project_id", "version_id", "user_id", "action", "entity_type", "entity_id"],
+            select(
+                literal(project_id),
+                literal(version.id),
+                literal(user.id),
+                literal("delete_team_member"),
+                literal("team_member"),
+                deleted.c.id,
+            ),
+        )
+        .returning(AuditLog.entity_id)
+    )
+    if audited is None:
         raise HTTPException(status_code=404, detail="Member not found")
-    await db.delete(member)
-    db.add(AuditLog(
-        project_id=project_id,
-        version_id=version.id,
-        user_id=user.id,
-        action="delete_team_member",
-        entity_type="team_member",
-        entity_id=member_id,
-    ))
     return {"ok": True}
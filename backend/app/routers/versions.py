@@ -7,12 +7,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.auth.deps import get_current_user, get_user_roles
+from app.auth.deps import UserSnapshot, get_current_user, get_user_roles
 from app.auth.rbac import can_edit_features, can_edit_team, can_lock_project, can_unlock_project
 from app.database import get_db
 from app.models.audit import AuditLog
 from app.models.project import Project, ProjectVersion, ProjectStatus
-from app.models.user import User
+from app.queries.version import LATEST_VERSION, get_latest_version
 from app.schemas.project import (
     ProjectVersionResponse,
     ProjectVersionUpdate,
@@ -22,21 +22,23 @@ from app.schemas.project import (
 router = APIRouter(prefix="/projects", tags=["versions"])
 
 
+def _status_str(status: str | ProjectStatus | None) -> str:
+    """Version status as a plain string; unset means draft."""
+    return status.value if isinstance(status, ProjectStatus) else (status or ProjectStatus.DRAFT.value)
+
+
 async def _get_version(db: AsyncSession, project_id: int, version_id: int | None = None) -> ProjectVersion:
-    result = await db.execute(
-        select(ProjectVersion)
-        .where(ProjectVersion.project_id == project_id)
-        .order_by(ProjectVersion.version_number.desc())
-        .limit(1)
-    )
-    version = result.scalar_one_or_none()
+    """The given version of the project, or its latest version when version_id is None."""
+    if version_id:
+        version = await db.scalar(
+            select(ProjectVersion).where(ProjectVersion.project_id == project_id, ProjectVersion.id == version_id)
+        )
+        if not version:
+            raise HTTPException(status_code=404, detail="Version not found")
+        return version
+    version = await get_latest_version(db, project_id)
     if not version:
         raise HTTPException(status_code=404, detail="Project or version not found")
-    if version_id and version.id != version_id:
-        v2 = await db.get(ProjectVersion, version_id)
-        if not v2 or v2.project_id != project_id:
-            raise HTTPException(status_code=404, detail="Version not found")
-        version = v2
     return version
 
 
@@ -44,14 +46,31 @@ async def _get_version(db: AsyncSession, project_id: int, version_id: int | None
 async def get_current_version(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
 ):
-    version = await _get_version(db, project_id)
+    # Plain column rows: this read-only endpoint needs no ORM instances in the session
+    result = await db.execute(
+        LATEST_VERSION.with_only_columns(
+            ProjectVersion.id,
+            ProjectVersion.project_id,
+            ProjectVersion.version_number,
+            ProjectVersion.status,
+            ProjectVersion.is_locked,
+            ProjectVersion.contingency_pct,
+            ProjectVersion.management_reserve_pct,
+            ProjectVersion.estimation_authority,
+            ProjectVersion.created_at,
+        ),
+        {"project_id": project_id},
+    )
+    version = result.first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Project or version not found")
     return ProjectVersionResponse(
         id=version.id,
         project_id=version.project_id,
         version_number=version.version_number,
-        status=version.status.value if hasattr(version.status, "value") else version.status,
+        status=_status_str(version.status),
         is_locked=version.is_locked,
         contingency_pct=version.contingency_pct,
         management_reserve_pct=version.management_reserve_pct,
@@ -66,7 +85,7 @@ async def update_version(
     version_id: int,
     data: ProjectVersionUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     version = await _get_version(db, project_id, version_id)
@@ -97,7 +116,7 @@ async def transition_status(
     project_id: int,
     version_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
     target_status: str = Query(..., description="Target status: review, submitted, won"),
 ):
@@ -105,13 +124,14 @@ async def transition_status(
     version = await _get_version(db, project_id, version_id)
     if version.is_locked:
         raise HTTPException(status_code=400, detail="Version is locked")
-    current = (version.status.value if hasattr(version.status, "value") else version.status) or "draft"
-    allowed = STATUS_TRANSITIONS.get(current.lower(), [])
+    current = _status_str(version.status)
+    # Stored statuses are lowercase (see migration 006)
+    allowed = STATUS_TRANSITIONS.get(current, frozenset())
     target = target_status.lower()
     if target not in allowed:
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot transition from {current} to {target}. Allowed: {allowed}",
+            detail=f"Cannot transition from {current} to {target}. Allowed: {sorted(allowed)}",
         )
     # Review/Submitted: DM, BA, Admin. Won: Finance/Admin only
     if target == "won":
@@ -120,7 +140,7 @@ async def transition_status(
     else:
         if not can_edit_features(roles):
             raise HTTPException(status_code=403, detail="Cannot transition status")
-    version.status = ProjectStatus(target)
+    version.status = ProjectStatus(target).value
     if target == "won":
         version.is_locked = True
         version.locked_by = user.id
@@ -143,7 +163,7 @@ async def lock_version(
     project_id: int,
     version_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
 ):
     """Mark as Won and lock. Only valid when status is Submitted."""
@@ -152,13 +172,13 @@ async def lock_version(
     version = await _get_version(db, project_id, version_id)
     if version.is_locked:
         raise HTTPException(status_code=400, detail="Already locked")
-    current = (version.status.value if hasattr(version.status, "value") else version.status) or "draft"
+    current = _status_str(version.status)
     if current.lower() != "submitted":
         raise HTTPException(
             status_code=400,
             detail="Can only lock when status is Submitted. Use status transition to move to Submitted first.",
         )
-    version.status = ProjectStatus.WON
+    version.status = ProjectStatus.WON.value
     version.is_locked = True
     version.locked_by = user.id
     version.locked_at = datetime.now(timezone.utc)
@@ -179,7 +199,7 @@ async def unlock_version(
     project_id: int,
     version_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[UserSnapshot, Depends(get_current_user)],
     roles: Annotated[list[str], Depends(get_user_roles)],
     reason: str = Query(..., min_length=1),
 ):
@@ -191,7 +211,7 @@ async def unlock_version(
     version.is_locked = False
     version.locked_by = None
     version.locked_at = None
-    version.status = ProjectStatus.SUBMITTED
+    version.status = ProjectStatus.SUBMITTED.value
     db.add(AuditLog(
         project_id=project_id,
         version_id=version.id,
@@ -14,6 +14,7 @@ from app.schemas.calculation import (
     ProfitabilityBreakdown,
     SprintAllocation,
     ReverseMarginResult,
+    CalculationSummary,
 )
 
 __all__ = [
@@ -37,4 +38,5 @@ __all__ = [
     "ProfitabilityBreakdown",
     "SprintAllocation",
     "ReverseMarginResult",
+    "CalculationSummary",
 ]
@@ -1,5 +1,5 @@
 """Auth schemas."""
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 
 
 class UserCreate(BaseModel):
@@ -8,6 +8,11 @@ class UserCreate(BaseModel):
     full_name: str
     role_ids: list[int] = []
 
+    @field_validator("role_ids")
+    @classmethod
+    def dedupe_role_ids(cls, v: list[int]) -> list[int]:
+        return list(dict.fromkeys(v))
+
 
 class UserLogin(BaseModel):
     email: str  # str to allow dev/internal emails like admin@dppe.local
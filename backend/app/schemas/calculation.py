@@ -45,3 +45,11 @@ class SprintPlanCostBreakdown(BaseModel):
     total_cost: Decimal
     contingency_pct: Decimal
     management_reserve_pct: Decimal
+
+
+class CalculationSummary(BaseModel):
+    """Cost, revenue, profitability and sprint figures from a single load of the version."""
+    cost: CostBreakdown
+    revenue: RevenueBreakdown
+    profitability: ProfitabilityBreakdown
+    sprint: SprintAllocation
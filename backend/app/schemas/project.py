@@ -40,11 +40,11 @@ class ProjectVersionUpdate(BaseModel):
 
 
 # Allowed status transitions: Draft→Review, Review→Submitted, Submitted→Won
-STATUS_TRANSITIONS: dict[str, list[str]] = {
-    "draft": ["review"],
-    "review": ["submitted", "draft"],
-    "submitted": ["won", "review"],
-    "won": [],  # Locked; unlock reverts to submitted
+STATUS_TRANSITIONS: dict[str, frozenset[str]] = {
+    "draft": frozenset({"review"}),
+    "review": frozenset({"submitted", "draft"}),
+    "submitted": frozenset({"won", "review"}),
+    "won": frozenset(),  # Locked; unlock reverts to submitted
 }
 
 
@@ -3,6 +3,8 @@ from decimal import Decimal
 
 from pydantic import BaseModel, Field
 
+from app.schemas.feature import FeatureCreate
+
 
 class TeamMemberCreate(BaseModel):
     role: str = Field(..., min_length=1, max_length=100)
@@ -42,7 +44,7 @@ class TeamMemberResponse(BaseModel):
 class AITeamSuggestionRequest(BaseModel):
     """Request body for AI team suggestion based on features."""
 
-    features: list[dict]  # [{name, effort_hours, priority, ...}]
+    features: list[FeatureCreate]
 
 
 class AITeamSuggestionResponse(BaseModel):
@@ -1,8 +1,13 @@
 """AI effort estimation and team allocation service."""
-import json
+import asyncio
+import hashlib
 import re
+from collections import defaultdict
 from decimal import Decimal
+from functools import lru_cache
 
+import orjson
+from cachetools import TTLCache
 from openai import AsyncOpenAI
 
 from app.config import get_settings
@@ -10,6 +15,11 @@ from app.schemas.feature import EffortAllocationCreate, FeatureCreate, FeatureTa
 from app.schemas.team import TeamMemberCreate
 
 
+_FTE_PLACES = Decimal("0.0001")
+_PCT_PLACES = Decimal("0.01")
+
+
+@lru_cache(maxsize=1)
 def _hours_per_fte_month() -> Decimal:
     """Hours per FTE-month: working_days * hours_per_day * utilization_pct/100."""
     s = get_settings()
@@ -23,13 +33,13 @@ def compute_fte(effort_hours: Decimal) -> Decimal:
     hpf = _hours_per_fte_month()
     if hpf <= 0:
         return Decimal(0)
-    return (effort_hours / hpf).quantize(Decimal("0.0001"))
+    return (effort_hours / hpf).quantize(_FTE_PLACES)
 
 
 FEATURE_EXTRACTION_PROMPT = """You are an expert software delivery estimator and business analyst. Your task is to extract a detailed feature breakdown from requirement documents (SOW, ToR, user stories, PRD, etc.).
 
 ## Output Format
-Return a JSON array of features. Each feature MUST have exactly these fields:
+Return a JSON object whose "features" key holds the array of features. Each feature MUST have exactly these fields:
 
 - sr_no: integer (sequential number, 1, 2, 3...)
 - name: string (clear, concise feature name)
@@ -60,7 +70,7 @@ Suggest the most appropriate role for each task. Use common delivery role names
 - UX Designer for design, wireframes, prototypes
 - Tech Lead, DevOps, Data Engineer, Project Manager when relevant
 
-If the organization has BU-configured roles, prefer these when they fit: {bu_role_names}
+If the organization has BU-configured roles (listed with the requirements), prefer these when they fit.
 Otherwise suggest the best-fit role for the task (e.g. Developer, QA Engineer, Business Analyst).
 The user will select a BU role in the grid for billing and cost calculation.
 Assign exactly one role per task.
@@ -80,7 +90,7 @@ Assign exactly one role per task.
 - If a section describes multiple sub-features, create separate features
 
 ## Example
-[
+{"features": [
   {
     "sr_no": 1,
     "name": "User Authentication",
@@ -97,16 +107,214 @@ Assign exactly one role per task.
       {"role": "QA Engineer", "allocation_pct": 22.2, "effort_hours": 8, "fte": 0.0625}
     ]
   }
-]
+]}
 
 Return ONLY valid JSON. No markdown, no explanation, no code blocks.
-
-Requirements:
 """
 
 
-def _build_feature_prompt(bu_role_names_str: str) -> str:
-    return FEATURE_EXTRACTION_PROMPT.replace("{bu_role_names}", bu_role_names_str)
+_MODEL = "gpt-4o-mini"
+_DEFAULT_ROLES = [
+    "Developer", "Senior Developer", "QA Engineer", "Business Analyst",
+    "UX Designer", "Tech Lead", "DevOps", "Data Engineer", "Project Manager",
+]
+_BATCH_DONE = frozenset({"completed", "failed", "expired", "cancelled"})
+# Caps concurrent chat completions so fan-outs like estimate_features_many stay under the rate limit
+_AI_SLOTS = asyncio.Semaphore(max(get_settings().ai_max_concurrency, 1))
+
+
+def _strict_object(**properties: dict) -> dict:
+    # Structured outputs in strict mode need every property required and no extras
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+# Structured output for FEATURE_EXTRACTION_PROMPT: the API guarantees JSON of this shape, so no fences or
+# malformed JSON reach _parse_features. Strict mode has no maxLength, so string lengths are still clamped there.
+_FEATURES_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "feature_breakdown",
+        "strict": True,
+        "schema": _strict_object(
+            features={
+                "type": "array",
+                "items": _strict_object(
+                    sr_no={"type": "integer"},
+                    name={"type": "string"},
+                    description={"type": "string"},
+                    priority={"type": "integer"},
+                    tasks={
+                        "type": "array",
+                        "items": _strict_object(
+                            name={"type": "string"},
+                            effort_hours={"type": "number"},
+                            role={"type": "string"},
+                            fte={"type": "number"},
+                        ),
+                    },
+                    effort_hours={"type": "number"},
+                    effort_allocations={
+                        "type": "array",
+                        "items": _strict_object(
+                            role={"type": "string"},
+                            allocation_pct={"type": "number"},
+                            effort_hours={"type": "number"},
+                            fte={"type": "number"},
+                        ),
+                    },
+                ),
+            },
+        ),
+    },
+}
+
+# Successful estimates keyed by document + role list; entries are shared, so treat them as read-only
+_estimate_cache: TTLCache[str, tuple[list[FeatureCreate], str]] = TTLCache(
+    maxsize=256, ttl=max(get_settings().ai_estimate_cache_ttl, 1)
+)
+_WHITESPACE = re.compile(r"\s+")
+# Leading ```lang fence and trailing ``` fence, removed in one pass
+_FENCES = re.compile(r"^```\w*\n?|\n?```$")
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> AsyncOpenAI:
+    """One client per process so calls reuse its pooled keep-alive connections."""
+    return AsyncOpenAI(api_key=get_settings().openai_api_key)
+
+
+async def close_client() -> None:
+    """Close the shared client's connections; call on application shutdown."""
+    if _get_client.cache_info().currsize:
+        await _get_client().close()
+        _get_client.cache_clear()
+
+
+def _estimate_key(requirement_text: str, role_list: list[str]) -> str:
+    """Re-uploads that differ only in whitespace or line breaks map to the same key."""
+    text = _WHITESPACE.sub(" ", requirement_text).strip()
+    return hashlib.sha256("\0".join([text, *role_list]).encode()).hexdigest()
+
+
+def _fit_input_budget(text: str) -> str:
+    """Trim text to ai_max_input_chars, cutting at the last paragraph or sentence break inside the budget."""
+    limit = get_settings().ai_max_input_chars
+    if len(text) <= limit:
+        return text
+    head = text[:limit]
+    for sep in ("\n\n", ".\n", ". ", "\n"):
+        i = head.rfind(sep)
+        if i > limit // 2:
+            return head[: i + len(sep)].rstrip()
+    return head
+
+
+def _feature_messages(requirement_text: str, role_list: list[str]) -> list[dict]:
+    # The instructions are byte-identical on every call and come first, so the provider's
+    # prompt cache can reuse them; everything per-request goes in the user turn after them
+    return [
+        {"role": "system", "content": FEATURE_EXTRACTION_PROMPT},
+        {
+            "role": "user",
+            "content": (
+                f"Preferred BU roles: {', '.join(role_list)}\n\nRequirements:\n{_fit_input_budget(requirement_text)}"
+            ),
+        },
+    ]
+
+
+def _strip_fences(content: str) -> str:
+    return _FENCES.sub("", content)
+
+
+def _dec(value) -> Decimal:
+    """JSON number or string to Decimal; ints convert directly, floats via their shortest repr."""
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+@lru_cache(maxsize=512)
+def _clean_role(raw: str) -> str:
+    # The same handful of role names repeat across every task and allocation
+    return raw.strip()[:100]
+
+
+def _parse_features(content: str, role_list: list[str]) -> list[FeatureCreate]:
+    """Map the model's {"features": [...]} output to FeatureCreate objects. Raises on invalid JSON."""
+    data = orjson.loads(content).get("features")
+    features = []
+    first_role = role_list[0] if role_list else "Developer"
+
+    def sanitize_role(raw: str) -> str:
+        """Use AI-suggested role as-is; only sanitize empty/invalid."""
+        return _clean_role(str(raw or "")) or first_role
+
+    for item in data if isinstance(data, list) else []:
+        tasks_raw = item.get("tasks", [])
+        tasks = []
+        for t in tasks_raw:
+            hrs = _dec(t.get("effort_hours", 0))
+            fte = t.get("fte")
+            task_fte = _dec(fte).quantize(_FTE_PLACES) if fte is not None else compute_fte(hrs)
+            tasks.append(
+                FeatureTaskCreate(
+                    name=str(t.get("name", "Unnamed"))[:500],
+                    effort_hours=hrs,
+                    role=sanitize_role(t.get("role", first_role)),
+                    fte=task_fte,
+                )
+            )
+        allocations = []
+        for a in item.get("effort_allocations", []):
+            alloc_hrs = _dec(a.get("effort_hours", item.get("effort_hours", 0)))
+            fte = a.get("fte")
+            alloc_fte = _dec(fte).quantize(_FTE_PLACES) if fte is not None else compute_fte(alloc_hrs)
+            allocations.append(
+                EffortAllocationCreate(
+                    role=sanitize_role(a.get("role", first_role)),
+                    allocation_pct=_dec(a.get("allocation_pct", 100)),
+                    effort_hours=alloc_hrs,
+                    fte=alloc_fte,
+                )
+            )
+        if not allocations and tasks:
+            role_hours: defaultdict[str, Decimal] = defaultdict(Decimal)
+            for t in tasks:
+                role_hours[t.role] += t.effort_hours
+            # Zero-hour tasks: every role gets 0% rather than dividing by zero
+            total = sum(role_hours.values(), Decimal(0)) or Decimal(1)
+            for role, hrs in role_hours.items():
+                pct = (hrs * 100 / total).quantize(_PCT_PLACES)
+                allocations.append(
+                    EffortAllocationCreate(
+                        role=role,
+                        allocation_pct=pct,
+                        effort_hours=hrs,
+                        fte=compute_fte(hrs),
+                    )
+                )
+        if not allocations:
+            item_hrs = _dec(item.get("effort_hours", 0))
+            allocations.append(
+                EffortAllocationCreate(
+                    role=first_role,
+                    allocation_pct=Decimal(100),
+                    effort_hours=item_hrs,
+                    fte=compute_fte(item_hrs),
+                )
+            )
+        features.append(
+            FeatureCreate(
+                name=str(item.get("name", "Unnamed"))[:255],
+                description=str(item.get("description", ""))[:2000] if item.get("description") else None,
+                priority=int(item.get("priority", 1)),
+                effort_hours=_dec(item.get("effort_hours", 0)),
+                effort_allocations=allocations,
+                tasks=tasks,
+            )
+        )
+    return features
 
 
 async def estimate_features_from_requirements(
@@ -117,109 +325,113 @@ async def estimate_features_from_requirements(
     bu_role_names: Optional BU-configured roles; AI prefers these when they fit, but can suggest
     other appropriate roles. User maps to BU roles in the grid for billing."""
     settings = get_settings()
-    role_list = bu_role_names if bu_role_names else [
-        "Developer", "Senior Developer", "QA Engineer", "Business Analyst",
-        "UX Designer", "Tech Lead", "DevOps", "Data Engineer", "Project Manager",
-    ]
-    bu_role_names_str = ", ".join(role_list)
+    role_list = bu_role_names or _DEFAULT_ROLES
     if not settings.openai_api_key:
         return [], "AI estimation unavailable: OPENAI_API_KEY not configured"
 
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-    try:
-        prompt = _build_feature_prompt(bu_role_names_str) + requirement_text
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You return only valid JSON. No markdown, no explanation."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-        )
-        content = response.choices[0].message.content or ""
-        content = re.sub(r"^```\w*\n?", "", content)
-        content = re.sub(r"\n?```$", "", content)
-        data = json.loads(content.strip())
-        features = []
-        first_role = role_list[0] if role_list else "Developer"
-
-        def sanitize_role(raw: str) -> str:
-            """Use AI-suggested role as-is; only sanitize empty/invalid."""
-            r = str(raw or "").strip()[:100]
-            return r if r else first_role
+    use_cache = settings.ai_estimate_cache_ttl > 0
+    key = _estimate_key(requirement_text, role_list) if use_cache else ""
+    cached = _estimate_cache.get(key) if use_cache else None
+    if cached is not None:
+        return cached
 
-        for item in data if isinstance(data, list) else []:
-            tasks_raw = item.get("tasks", [])
-            tasks = []
-            for t in tasks_raw:
-                hrs = Decimal(str(t.get("effort_hours", 0)))
-                task_fte = None
-                if "fte" in t and t.get("fte") is not None:
-                    task_fte = Decimal(str(t["fte"])).quantize(Decimal("0.0001"))
-                else:
-                    task_fte = compute_fte(hrs)
-                tasks.append(
-                    FeatureTaskCreate(
-                        name=str(t.get("name", "Unnamed"))[:500],
-                        effort_hours=hrs,
-                        role=sanitize_role(t.get("role", first_role)),
-                        fte=task_fte,
-                    )
-                )
-            allocations = []
-            for a in item.get("effort_allocations", []):
-                alloc_hrs = Decimal(str(a.get("effort_hours", item.get("effort_hours", 0))))
-                alloc_fte = None
-                if "fte" in a and a.get("fte") is not None:
-                    alloc_fte = Decimal(str(a["fte"])).quantize(Decimal("0.0001"))
-                else:
-                    alloc_fte = compute_fte(alloc_hrs)
-                allocations.append(
-                    EffortAllocationCreate(
-                        role=sanitize_role(a.get("role", first_role)),
-                        allocation_pct=Decimal(str(a.get("allocation_pct", 100))),
-                        effort_hours=alloc_hrs,
-                        fte=alloc_fte,
-                    )
-                )
-            if not allocations and tasks:
-                role_hours: dict[str, Decimal] = {}
-                for t in tasks:
-                    role_hours[t.role] = role_hours.get(t.role, Decimal(0)) + t.effort_hours
-                total = sum(role_hours.values()) or Decimal(1)
-                for role, hrs in role_hours.items():
-                    pct = (hrs / total * 100).quantize(Decimal("0.01"))
-                    allocations.append(
-                        EffortAllocationCreate(
-                            role=role,
-                            allocation_pct=pct,
-                            effort_hours=hrs,
-                            fte=compute_fte(hrs),
-                        )
-                    )
-            if not allocations:
-                item_hrs = Decimal(str(item.get("effort_hours", 0)))
-                allocations.append(
-                    EffortAllocationCreate(
-                        role=first_role,
-                        allocation_pct=Decimal(100),
-                        effort_hours=item_hrs,
-                        fte=compute_fte(item_hrs),
-                    )
-                )
-            features.append(
-                FeatureCreate(
-                    name=str(item.get("name", "Unnamed"))[:255],
-                    description=str(item.get("description", ""))[:2000] if item.get("description") else None,
-                    priority=int(item.get("priority", 1)),
-                    effort_hours=Decimal(str(item.get("effort_hours", 0))),
-                    effort_allocations=allocations,
-                    tasks=tasks,
-                )
+    client = _get_client()
+    try:
+        async with _AI_SLOTS:
+            response = await client.chat.completions.create(
+                model=_MODEL,
+                messages=_feature_messages(requirement_text, role_list),
+                temperature=0.2,
+                response_format=_FEATURES_RESPONSE_FORMAT,
             )
-        return features, content
+        content = response.choices[0].message.content or ""
+        features = _parse_features(content, role_list)
     except Exception as e:
         return [], str(e)
+    if use_cache and features:
+        _estimate_cache[key] = (features, content)
+    return features, content
+
+
+async def estimate_features_many(
+    requirement_texts: list[str],
+    bu_role_names: list[str] | None = None,
+) -> list[tuple[list[FeatureCreate], str]]:
+    """Estimate several documents concurrently (bounded by ai_max_concurrency); results keep input order."""
+    return await asyncio.gather(
+        *(estimate_features_from_requirements(text, bu_role_names) for text in requirement_texts)
+    )
+
+
+async def estimate_features_batch(
+    documents: list[tuple[str, str, list[str] | None]],
+    poll_seconds: float = 30.0,
+) -> dict[str, tuple[list[FeatureCreate], str]]:
+    """Estimate several requirement documents in one OpenAI Batch API job (about half the live price).
+
+    documents: (custom_id, requirement_text, bu_role_names) per document; results are keyed by custom_id.
+    A batch may take up to 24h to finish, so call this from a script or background job, never a request
+    handler. estimate_features_from_requirements stays the interactive path.
+    """
+    settings = get_settings()
+    if not settings.openai_api_key:
+        msg = "AI estimation unavailable: OPENAI_API_KEY not configured"
+        return {custom_id: ([], msg) for custom_id, _, _ in documents}
+
+    role_lists = {}
+    lines = []
+    for custom_id, requirement_text, bu_role_names in documents:
+        role_list = bu_role_names or _DEFAULT_ROLES
+        role_lists[custom_id] = role_list
+        lines.append(orjson.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": _MODEL,
+                "messages": _feature_messages(requirement_text, role_list),
+                "temperature": 0.2,
+                "response_format": _FEATURES_RESPONSE_FORMAT,
+            },
+        }))
+
+    client = _get_client()
+    input_file = await client.files.create(file=("features.jsonl", b"\n".join(lines)), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    while batch.status not in _BATCH_DONE:
+        await asyncio.sleep(poll_seconds)
+        batch = await client.batches.retrieve(batch.id)
+
+    results = {custom_id: ([], f"Batch {batch.id} ended with status {batch.status}") for custom_id in role_lists}
+    if batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            custom_id = record["custom_id"]
+            body = (record.get("response") or {}).get("body") or {}
+            try:
+                content = body["choices"][0]["message"]["content"] or ""
+                results[custom_id] = (_parse_features(content, role_lists[custom_id]), content)
+            except Exception as e:
+                results[custom_id] = ([], str(record.get("error") or e))
+    if batch.error_file_id:
+        # Requests that failed inside the batch are written here, not to the output file
+        errors = await client.files.content(batch.error_file_id)
+        for line in errors.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            error = body.get("error") or record.get("error") or {}
+            message = error.get("message") if isinstance(error, dict) else error
+            results[record["custom_id"]] = ([], str(message or error))
+    return results
 
 
 async def suggest_team_allocation(
@@ -263,28 +475,27 @@ Rules:
 - Use member_name: null (we don't assign names yet)
 """
     try:
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You return only valid JSON. No markdown, no explanation."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-        )
-        content = response.choices[0].message.content or ""
-        content = re.sub(r"^```\w*\n?", "", content)
-        content = re.sub(r"\n?```$", "", content)
-        data = json.loads(content.strip())
+        client = _get_client()
+        async with _AI_SLOTS:
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You return only valid JSON. No markdown, no explanation."},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+            )
+        content = _strip_fences(response.choices[0].message.content or "")
+        data = orjson.loads(content)
         members = []
         for item in data if isinstance(data, list) else []:
             members.append(
                 TeamMemberCreate(
                     role=str(item.get("role", "Developer")),
                     member_name=None,
-                    cost_rate_per_day=Decimal(str(item.get("cost_rate_per_day", 400))),
-                    billing_rate_per_day=Decimal(str(item.get("billing_rate_per_day", 960))),
-                    utilization_pct=Decimal(str(item.get("utilization_pct", 80))),
+                    cost_rate_per_day=_dec(item.get("cost_rate_per_day", 400)),
+                    billing_rate_per_day=_dec(item.get("billing_rate_per_day", 960)),
+                    utilization_pct=_dec(item.get("utilization_pct", 80)),
                     working_days_per_month=int(item.get("working_days_per_month", 20)),
                     hours_per_day=int(item.get("hours_per_day", 8)),
                 )
@@ -1,8 +1,9 @@
 """Authentication service."""
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.auth.jwt import create_access_token, get_password_hash, verify_password
+from app.auth.jwt import get_password_hash_async, verify_login_async
 from app.models.user import Role, User, UserRole
 from app.schemas.auth import UserCreate, UserLogin, UserResponse
 
@@ -11,24 +12,28 @@ async def create_user(db: AsyncSession, data: UserCreate) -> User:
     """Create user with roles."""
     user = User(
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=await get_password_hash_async(data.password),
         full_name=data.full_name,
     )
     db.add(user)
     await db.flush()
-    for role_id in data.role_ids:
-        db.add(UserRole(user_id=user.id, role_id=role_id))
+    if data.role_ids:
+        # Deduped here too, for callers that build UserCreate with model_construct
+        await db.execute(
+            insert(UserRole), [{"user_id": user.id, "role_id": rid} for rid in dict.fromkeys(data.role_ids)]
+        )
     await db.refresh(user)
     return user
 
 
 async def authenticate_user(db: AsyncSession, data: UserLogin) -> User | None:
-    """Authenticate user by email and password."""
-    result = await db.execute(
-        select(User).where(User.email == data.email)
+    """Authenticate user by email and password. Roles are loaded for user_to_response."""
+    user = await db.scalar(
+        select(User)
+        .options(selectinload(User.user_roles).selectinload(UserRole.role))
+        .where(func.lower(User.email) == data.email.lower())
     )
-    user = result.scalar_one_or_none()
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await verify_login_async(data.email, data.password, user.hashed_password):
         return None
     return user
 
@@ -0,0 +1,45 @@
+"""Process-local cache of BU default rates (role -> (cost, billing) per day)."""
+import asyncio
+import time
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bu_rate import RoleDefaultRate
+
+TTL_SECONDS = 60.0
+
+_value: dict[str, tuple[Decimal, Decimal]] | None = None
+_expires = 0.0
+_generation = 0
+_lock = asyncio.Lock()
+
+
+async def get_default_rates(db: AsyncSession) -> dict[str, tuple[Decimal, Decimal]]:
+    """BU rates keyed by trimmed role name; reloaded at most once per TTL. Treat as read-only."""
+    global _value, _expires
+    if _value is not None and _expires > time.monotonic():
+        return _value
+    async with _lock:
+        if _value is not None and _expires > time.monotonic():
+            return _value
+        generation = _generation
+        rates = (await db.scalars(select(RoleDefaultRate))).all()
+        value = {r.role.strip(): (r.cost_rate_per_day, r.billing_rate_per_day) for r in rates}
+        # Don't publish a load that raced with a write
+        if generation == _generation:
+            _value, _expires = value, time.monotonic() + TTL_SECONDS
+        return value
+
+
+async def get_role_names(db: AsyncSession) -> list[str]:
+    """Sorted, non-empty BU role names from the cached rates."""
+    return sorted(role for role in await get_default_rates(db) if role)
+
+
+def invalidate() -> None:
+    """Drop cached rates; call after committing a change to role_default_rates."""
+    global _value, _generation
+    _value = None
+    _generation += 1
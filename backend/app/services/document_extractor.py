@@ -1,13 +1,31 @@
 """Extract text from uploaded documents (PDF, DOCX, TXT)."""
+import asyncio
 import io
+import multiprocessing
+import os
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
-from docx import Document
+from lxml import etree
 from pypdf import PdfReader
 
+# Opt-in: MuPDF's C extractor is far faster than pypdf, but PyMuPDF is AGPL-3.0, so it is not a base requirement
+try:
+    import fitz
+except ImportError:
+    fitz = None
 
-def extract_text_from_file(file_content: bytes, filename: str) -> str:
-    """Extract plain text from PDF, DOCX, or TXT file."""
+
+async def extract_text_from_file(file_content: bytes, filename: str) -> str:
+    """Extract plain text from PDF, DOCX, or TXT file in a worker thread, off the event loop."""
+    return await asyncio.to_thread(_extract_text_from_file_sync, file_content, filename)
+
+
+def _extract_text_from_file_sync(file_content: bytes, filename: str) -> str:
     ext = Path(filename).suffix.lower()
     if ext == ".pdf":
         return _extract_pdf(file_content)
@@ -22,16 +40,78 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
     raise ValueError(f"Unsupported file type: {ext}. Use PDF, DOCX, or TXT.")
 
 
+# Fallback path: pypdf is pure Python, so threads would serialize on the GIL; long PDFs are split across processes
+_PDF_WORKERS = min(4, os.cpu_count() or 1)
+_PARALLEL_MIN_PAGES = 16
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the server process has an event loop and threads running
+            _pool = ProcessPoolExecutor(_PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the PDF worker processes, if any were started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _extract_pdf_pages(content: bytes, start: int, stop: int) -> list[str]:
+    """Text of pages [start, stop); runs in a worker process with its own reader."""
+    reader = PdfReader(io.BytesIO(content))
+    return [text for text in (reader.pages[i].extract_text() for i in range(start, stop)) if text]
+
+
 def _extract_pdf(content: bytes) -> str:
+    if fitz is not None:
+        with fitz.open(stream=content, filetype="pdf") as doc:
+            parts = [text for text in (page.get_text("text") for page in doc) if text.strip()]
+        return "\n\n".join(parts)
     reader = PdfReader(io.BytesIO(content))
-    parts = []
-    for page in reader.pages:
-        text = page.extract_text()
-        if text:
-            parts.append(text)
+    page_count = len(reader.pages)
+    if page_count < _PARALLEL_MIN_PAGES or _PDF_WORKERS < 2:
+        parts = [text for text in (page.extract_text() for page in reader.pages) if text]
+    else:
+        step = -(-page_count // _PDF_WORKERS)
+        starts = range(0, page_count, step)
+        stops = [min(start + step, page_count) for start in starts]
+        chunks = _get_pool().map(_extract_pdf_pages, repeat(content, len(stops)), starts, stops)
+        parts = [text for chunk in chunks for text in chunk]
     return "\n\n".join(parts) if parts else ""
 
 
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_TEXT = _W + "t"
+# Run content that python-docx renders as whitespace
+_W_SPECIAL = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n"}
+
+
 def _extract_docx(content: bytes) -> str:
-    doc = Document(io.BytesIO(content))
-    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+    """Paragraph text from word/document.xml, decompressed and parsed as one stream so neither the XML
+    nor the document tree is ever held whole."""
+    lines = []
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive, archive.open("word/document.xml") as xml:
+            for _, paragraph in etree.iterparse(
+                xml, events=("end",), tag=_W + "p", resolve_entities=False, no_network=True
+            ):
+                text = "".join(
+                    (el.text or "") if el.tag == _W_TEXT else _W_SPECIAL[el.tag]
+                    for el in paragraph.iter(_W_TEXT, *_W_SPECIAL)
+                )
+                if text.strip():
+                    lines.append(text)
+                # Cleared paragraphs free memory and are not re-read by an enclosing (text box) paragraph
+                paragraph.clear()
+    except (zipfile.BadZipFile, KeyError, zlib.error, etree.XMLSyntaxError):
+        raise ValueError("Could not read DOCX file. Please check the file is a valid Word document.")
+    return "\n".join(lines)
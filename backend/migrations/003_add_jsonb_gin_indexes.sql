@@ -0,0 +1,9 @@
+-- GIN indexes for JSONB containment (@>) queries on feature tasks and sprint plan allocations
+-- jsonb_path_ops only supports @> but is roughly half the size of the default jsonb_ops.
+-- Usage: psql -d your_database -f 003_add_jsonb_gin_indexes.sql
+
+CREATE INDEX IF NOT EXISTS idx_features_tasks_gin
+ON features USING GIN (tasks jsonb_path_ops);
+
+CREATE INDEX IF NOT EXISTS idx_sprint_plan_rows_allocations_gin
+ON sprint_plan_rows USING GIN (allocations jsonb_path_ops);
@@ -0,0 +1,7 @@
+-- Composite index for "latest version of a project" lookups:
+--   WHERE project_id = ? ORDER BY version_number DESC LIMIT 1
+-- Postgres walks the index backward, so no separate DESC index is needed.
+-- Usage: psql -d your_database -f 004_add_project_versions_lookup_index.sql
+
+CREATE INDEX IF NOT EXISTS ix_project_versions_project_id_version_number
+ON project_versions (project_id, version_number);
@@ -0,0 +1,8 @@
+-- Composite indexes for per-feature change logs, newest first
+-- Usage: psql -d your_database -f 005_add_estimation_log_indexes.sql
+
+CREATE INDEX IF NOT EXISTS ix_estimation_history_version_feature_changed_at
+ON estimation_history (version_id, feature_id, changed_at DESC);
+
+CREATE INDEX IF NOT EXISTS ix_justification_logs_version_feature_created_at
+ON justification_logs (version_id, feature_id, created_at DESC);
@@ -0,0 +1,18 @@
+-- Store projects.revenue_model and project_versions.status as varchar instead of PG enums.
+-- Values are validated in the application (RevenueModel / ProjectStatus), so adding a new
+-- status no longer needs ALTER TYPE. Enum labels may be stored as names (FIXED, DRAFT) or
+-- values (review, won); both are normalized to the lowercase values the app uses.
+-- Usage: psql -d your_database -f 006_enum_columns_to_varchar.sql
+
+BEGIN;
+
+ALTER TABLE projects
+ALTER COLUMN revenue_model TYPE varchar(16) USING lower(revenue_model::text);
+
+ALTER TABLE project_versions
+ALTER COLUMN status TYPE varchar(16) USING lower(status::text);
+
+DROP TYPE IF EXISTS revenuemodel;
+DROP TYPE IF EXISTS projectstatus;
+
+COMMIT;
@@ -0,0 +1,8 @@
+-- Case-insensitive unique index for login lookups:
+--   WHERE lower(email) = ?
+-- Fails if existing emails differ only in case; merge those accounts first.
+-- CONCURRENTLY cannot run inside a transaction, so do not wrap this file in BEGIN/COMMIT.
+-- Usage: psql -d your_database -f 007_add_users_email_lower_index.sql
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_lower
+ON users (lower(email));
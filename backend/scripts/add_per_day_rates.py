@@ -5,28 +5,31 @@ from app.database import engine
 
 
 async def migrate():
+    # One DO block, one round-trip. The nested BEGIN/EXCEPTION is a subtransaction, so a missing
+    # legacy column does not abort the rest of the migration.
     async with engine.begin() as conn:
-        await conn.execute(text("ALTER TABLE team_members ADD COLUMN IF NOT EXISTS cost_rate_per_day NUMERIC(18,2)"))
-        await conn.execute(text("ALTER TABLE team_members ADD COLUMN IF NOT EXISTS billing_rate_per_day NUMERIC(18,2)"))
-        try:
-            await conn.execute(text("ALTER TABLE team_members ALTER COLUMN monthly_cost_rate DROP NOT NULL"))
-        except Exception:
-            pass
         await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS role_default_rates (
-                id SERIAL PRIMARY KEY,
-                role VARCHAR(100) NOT NULL UNIQUE,
-                cost_rate_per_day NUMERIC(18,2) NOT NULL,
-                billing_rate_per_day NUMERIC(18,2) NOT NULL
-            )
-        """))
-        await conn.execute(text("""
-            UPDATE team_members SET cost_rate_per_day = monthly_cost_rate / NULLIF(working_days_per_month, 0)
-            WHERE cost_rate_per_day IS NULL AND monthly_cost_rate IS NOT NULL
-        """))
-        await conn.execute(text("""
-            UPDATE team_members SET billing_rate_per_day = billing_rate * hours_per_day
-            WHERE billing_rate_per_day IS NULL AND billing_rate IS NOT NULL AND hours_per_day IS NOT NULL
+            DO $$
+            BEGIN
+                ALTER TABLE team_members ADD COLUMN IF NOT EXISTS cost_rate_per_day NUMERIC(18,2);
+                ALTER TABLE team_members ADD COLUMN IF NOT EXISTS billing_rate_per_day NUMERIC(18,2);
+                BEGIN
+                    ALTER TABLE team_members ALTER COLUMN monthly_cost_rate DROP NOT NULL;
+                EXCEPTION WHEN undefined_column THEN
+                    NULL;
+                END;
+                CREATE TABLE IF NOT EXISTS role_default_rates (
+                    id SERIAL PRIMARY KEY,
+                    role VARCHAR(100) NOT NULL UNIQUE,
+                    cost_rate_per_day NUMERIC(18,2) NOT NULL,
+                    billing_rate_per_day NUMERIC(18,2) NOT NULL
+                );
+                UPDATE team_members SET cost_rate_per_day = monthly_cost_rate / NULLIF(working_days_per_month, 0)
+                WHERE cost_rate_per_day IS NULL AND monthly_cost_rate IS NOT NULL;
+                UPDATE team_members SET billing_rate_per_day = billing_rate * hours_per_day
+                WHERE billing_rate_per_day IS NULL AND billing_rate IS NOT NULL AND hours_per_day IS NOT NULL;
+            END
+            $$
         """))
     print("Migration complete")
 
@@ -6,7 +6,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.database import async_session_maker, init_db
 from app.models.user import Role, User, UserRole
@@ -27,10 +27,11 @@ ROLES = [
 async def seed():
     await init_db()
     async with async_session_maker() as db:
-        for name, desc in ROLES:
-            r = await db.execute(select(Role).where(Role.name == name))
-            if not r.scalar_one_or_none():
-                db.add(Role(name=name, description=desc))
+        await db.execute(
+            pg_insert(Role)
+            .values([{"name": name, "description": desc} for name, desc in ROLES])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
         await db.commit()
 
         admin_role = (await db.execute(select(Role).where(Role.name == "admin"))).scalar_one()
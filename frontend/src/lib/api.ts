@@ -156,6 +156,8 @@ export const repositoryApi = {
 };
 
 export const calculationsApi = {
+  summary: (projectId: number) =>
+    api<CalculationSummary>(`/projects/${projectId}/calculations/summary`),
   cost: (projectId: number) => api<CostBreakdown>(`/projects/${projectId}/calculations/cost`),
   sprintPlanCost: (projectId: number) =>
     api<SprintPlanCostBreakdown>(`/projects/${projectId}/calculations/sprint-plan-cost`),
@@ -327,15 +329,16 @@ export interface RepositoryItem {
   created_by: number;
   created_at: string;
   status: string;
-  revenue?: number;
-  cost?: number;
-  margin_pct?: number;
+  // Decimal amounts are sent as strings to keep full precision
+  revenue?: string;
+  cost?: string;
+  margin_pct?: string;
 }
 
 export interface DashboardData {
-  total_simulated_revenue: number;
-  total_simulated_cost: number;
-  avg_margin_pct: number;
+  total_simulated_revenue: string;
+  total_simulated_cost: string;
+  avg_margin_pct: string;
   project_count: number;
   projects_below_threshold: number;
   top_roles: [string, number][];
@@ -369,6 +372,13 @@ export interface SprintAllocation {
   effort_per_sprint: number;
 }
 
+export interface CalculationSummary {
+  cost: CostBreakdown;
+  revenue: RevenueBreakdown;
+  profitability: ProfitabilityBreakdown;
+  sprint: SprintAllocation;
+}
+
 export interface ReverseMarginResult {
   target_margin_pct: number;
   required_revenue: number;
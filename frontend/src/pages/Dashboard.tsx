@@ -111,7 +111,7 @@ export default function Dashboard() {
                 </Typography>
               </Box>
               <Typography variant="h4" fontWeight={600}>
-                {formatCurrency(data.total_simulated_revenue)}
+                {formatCurrency(Number(data.total_simulated_revenue))}
               </Typography>
             </CardContent>
           </Card>
@@ -126,7 +126,7 @@ export default function Dashboard() {
                 </Typography>
               </Box>
               <Typography variant="h4" fontWeight={600}>
-                {formatCurrency(data.total_simulated_cost)}
+                {formatCurrency(Number(data.total_simulated_cost))}
               </Typography>
             </CardContent>
           </Card>
@@ -141,7 +141,7 @@ export default function Dashboard() {
                 </Typography>
               </Box>
               <Typography variant="h4" fontWeight={600}>
-                {data.avg_margin_pct.toFixed(1)}%
+                {Number(data.avg_margin_pct).toFixed(1)}%
               </Typography>
             </CardContent>
           </Card>
@@ -211,9 +211,9 @@ export default function Dashboard() {
                         <TableCell align="right">
                           {p.margin_pct != null ? (
                             <Chip
-                              label={`${p.margin_pct.toFixed(1)}%`}
+                              label={`${Number(p.margin_pct).toFixed(1)}%`}
                               size="small"
-                              color={p.margin_pct < 15 ? "warning" : "default"}
+                              color={Number(p.margin_pct) < 15 ? "warning" : "default"}
                               variant="outlined"
                             />
                           ) : (
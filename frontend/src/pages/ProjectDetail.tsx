@@ -145,24 +145,18 @@ export default function ProjectDetail() {
   });
 
   const {
-    data: cost,
-    isLoading: costLoading,
-    isError: costError,
+    data: summary,
+    isLoading: summaryLoading,
+    isError: summaryError,
   } = useQuery({
-    queryKey: ["cost", projectId],
-    queryFn: () => calculationsApi.cost(projectId),
-    enabled: projectId > 0 && activeTab === "calculations",
-  });
-
-  const {
-    data: profitability,
-    isLoading: profitabilityLoading,
-    isError: profitabilityError,
-  } = useQuery({
-    queryKey: ["profitability", projectId],
-    queryFn: () => calculationsApi.profitability(projectId),
-    enabled: projectId > 0 && activeTab === "calculations",
+    queryKey: ["calculationSummary", projectId],
+    queryFn: () => calculationsApi.summary(projectId),
+    enabled: projectId > 0,
   });
+  const cost = summary?.cost;
+  const profitability = summary?.profitability;
+  const sprint = summary?.sprint;
+  const sprintLoading = summaryLoading;
 
   const {
     data: sprintPlanCost,
@@ -173,16 +167,6 @@ export default function ProjectDetail() {
     enabled: projectId > 0 && activeTab === "calculations",
   });
 
-  const {
-    data: sprint,
-    isLoading: sprintLoading,
-    isError: sprintError,
-  } = useQuery({
-    queryKey: ["sprint", projectId],
-    queryFn: () => calculationsApi.sprint(projectId),
-    enabled: projectId > 0,
-  });
-
   const {
     data: reverseMargin,
     isLoading: reverseMarginLoading,
@@ -315,13 +299,14 @@ export default function ProjectDetail() {
     },
   });
 
-  const calcLoading = costLoading || profitabilityLoading || sprintLoading || sprintPlanCostLoading;
-  const calcError = costError || profitabilityError || sprintError;
+  const calcLoading = summaryLoading || sprintPlanCostLoading;
+  const calcError = summaryError;
 
   const addMemberMutation = useMutation({
     mutationFn: (data: TeamMemberCreate) => teamApi.add(projectId, data),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["team", projectId] });
+      queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       queryClient.invalidateQueries({ queryKey: ["sprintPlan", projectId] });
       sprintPlanInitializedRef.current = false;
       setShowAddMember(false);
@@ -333,6 +318,7 @@ export default function ProjectDetail() {
       teamApi.update(projectId, id, data),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["team", projectId] });
+      queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       queryClient.invalidateQueries({ queryKey: ["sprintPlan", projectId] });
       sprintPlanInitializedRef.current = false;
       setEditingMember(null);
@@ -343,6 +329,7 @@ export default function ProjectDetail() {
     mutationFn: (memberId: number) => teamApi.delete(projectId, memberId),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["team", projectId] });
+      queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       queryClient.invalidateQueries({ queryKey: ["sprintPlan", projectId] });
       sprintPlanInitializedRef.current = false;
     },
@@ -352,6 +339,7 @@ export default function ProjectDetail() {
     mutationFn: (data: FeatureCreate) => featuresApi.add(projectId, data),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["features", projectId] });
+      queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       setShowAddFeature(false);
     },
   });
@@ -407,6 +395,7 @@ export default function ProjectDetail() {
           }
         }
         queryClient.invalidateQueries({ queryKey: ["features", projectId] });
+        queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       }, 600);
     },
     [features, projectId, queryClient]
@@ -572,6 +561,7 @@ export default function ProjectDetail() {
                   features={features}
                   onAdded={() => {
                     queryClient.invalidateQueries({ queryKey: ["team", projectId] });
+                    queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
                     queryClient.invalidateQueries({ queryKey: ["sprintPlan", projectId] });
                   }}
                 />
@@ -589,6 +579,7 @@ export default function ProjectDetail() {
               features={features}
               onDone={() => {
                 queryClient.invalidateQueries({ queryKey: ["team", projectId] });
+                queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
                 setShowAiTeamSuggest(false);
               }}
               onCancel={() => setShowAiTeamSuggest(false)}
@@ -673,6 +664,7 @@ export default function ProjectDetail() {
               team={team ?? []}
               onFeaturesAdded={() => {
                 queryClient.invalidateQueries({ queryKey: ["features", projectId] });
+                queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
                 setShowAiUpload(false);
               }}
               onCancel={() => setShowAiUpload(false)}
@@ -698,9 +690,7 @@ export default function ProjectDetail() {
                 onContingencyChange={(pct) => {
                   versionsApi.update(projectId, version!.id, { contingency_pct: pct }).then(() => {
                     queryClient.invalidateQueries({ queryKey: ["version", projectId] });
-                    queryClient.invalidateQueries({ queryKey: ["cost", projectId] });
-                    queryClient.invalidateQueries({ queryKey: ["profitability", projectId] });
-                    queryClient.invalidateQueries({ queryKey: ["sprint", projectId] });
+                    queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
                     queryClient.invalidateQueries({ queryKey: ["reverseMargin", projectId] });
                   });
                 }}
@@ -960,6 +950,7 @@ function AiUploadAndSuggest({
       try {
         await featuresApi.add(projectId, f);
         queryClient.invalidateQueries({ queryKey: ["features", projectId] });
+        queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       } catch (e) {
         setAiError(e instanceof Error ? e.message : "Failed to add feature");
         return;
@@ -990,6 +981,7 @@ function AiUploadAndSuggest({
     try {
       await teamApi.add(projectId, m);
       queryClient.invalidateQueries({ queryKey: ["team", projectId] });
+      queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       setTeamSuggestions((prev) => prev?.filter((_, i) => i !== idx) ?? null);
     } catch (e) {
       setTeamError(e instanceof Error ? e.message : "Failed to add team member");
@@ -1047,9 +1039,7 @@ function AiUploadAndSuggest({
                 onContingencyChange={(pct) => {
                   versionsApi.update(projectId, version.id, { contingency_pct: pct }).then(() => {
                     queryClient.invalidateQueries({ queryKey: ["version", projectId] });
-                    queryClient.invalidateQueries({ queryKey: ["cost", projectId] });
-                    queryClient.invalidateQueries({ queryKey: ["profitability", projectId] });
-                    queryClient.invalidateQueries({ queryKey: ["sprint", projectId] });
+                    queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
                     queryClient.invalidateQueries({ queryKey: ["reverseMargin", projectId] });
                   });
                 }}
@@ -1140,6 +1130,7 @@ function AiTeamSuggestCard({
     try {
       await teamApi.add(projectId, m);
       queryClient.invalidateQueries({ queryKey: ["team", projectId] });
+      queryClient.invalidateQueries({ queryKey: ["calculationSummary", projectId] });
       setSuggestions((prev) => prev?.filter((_, i) => i !== idx) ?? null);
     } catch (e) {
       setError(e instanceof Error ? e.message : "Failed to add");
@@ -168,7 +168,7 @@ export default function Repository() {
                         Revenue
                       </Typography>
                       <Typography variant="body2" fontWeight={600}>
-                        {p.revenue != null ? formatCurrency(p.revenue, p.currency) : "-"}
+                        {p.revenue != null ? formatCurrency(Number(p.revenue), p.currency) : "-"}
                       </Typography>
                     </Box>
                     <Box sx={{ flex: 1, minWidth: 0 }}>
@@ -176,7 +176,7 @@ export default function Repository() {
                         Cost
                       </Typography>
                       <Typography variant="body2" fontWeight={600}>
-                        {p.cost != null ? formatCurrency(p.cost, p.currency) : "-"}
+                        {p.cost != null ? formatCurrency(Number(p.cost), p.currency) : "-"}
                       </Typography>
                     </Box>
                     <Box sx={{ flex: 1, minWidth: 0 }}>
@@ -185,13 +185,13 @@ export default function Repository() {
                       </Typography>
                       {p.margin_pct != null ? (
                         <Chip
-                          label={`${p.margin_pct.toFixed(1)}%`}
+                          label={`${Number(p.margin_pct).toFixed(1)}%`}
                           size="small"
-                          color={p.margin_pct < 15 ? "warning" : "success"}
+                          color={Number(p.margin_pct) < 15 ? "warning" : "success"}
                           sx={{
                             fontWeight: 600,
                             mt: 0.25,
-                            bgcolor: p.margin_pct < 15 ? alpha("#ff9500", 0.12) : alpha("#34c759", 0.12),
+                            bgcolor: Number(p.margin_pct) < 15 ? alpha("#ff9500", 0.12) : alpha("#34c759", 0.12),
                           }}
                         />
                       ) : (